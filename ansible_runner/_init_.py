@@ -7,7 +7,41 @@ Recruiter Standard Comment Style:
 - Maintainer: (add your name/email)
 """
 
-from . import cli, logger, config_loader, runner, utils, exceptions
+from . import (
+    cli,
+    logger,
+    config_loader,
+    runner,
+    utils,
+    exceptions,
+    workflow,
+    journal,
+    preflight,
+    ssh_pool,
+    autotune,
+    spawn,
+    limits,
+    project,
+    incremental,
+    facts,
+)
 
-__all__ = ["cli", "logger", "config_loader", "runner", "utils", "exceptions"]
+__all__ = [
+    "cli",
+    "logger",
+    "config_loader",
+    "runner",
+    "utils",
+    "exceptions",
+    "workflow",
+    "journal",
+    "preflight",
+    "ssh_pool",
+    "autotune",
+    "spawn",
+    "limits",
+    "project",
+    "incremental",
+    "facts",
+]
 __version__ = "0.1.0"
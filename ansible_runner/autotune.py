@@ -0,0 +1,189 @@
+"""
+Purpose: Auto-tune forks, strategy and pipelining from trial measurements.
+
+For each candidate in the search space, a short calibration pass is run
+against the inventory. By default this is a generated ping playbook
+without fact gathering; a configured playbook runs in check mode instead.
+Each pass records wall time, hosts per second and controller CPU (the
+user+system time of the child processes). One discarded warm-up pass runs
+first, so SSH master connections and cached facts are not only paid for by
+the first candidate, and repeated trials run in interleaved rounds over all
+candidates so drift during tuning is spread evenly. The fastest candidate
+wins.
+Among candidates within 5% of the best throughput, the one that uses the
+least controller CPU is chosen.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import resource
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from ansible_runner.config_loader import TuningProfile
+from ansible_runner.exceptions import RunnerError
+from ansible_runner.utils import parse_inventory_hosts, safe_join
+
+logger = logging.getLogger(__name__)
+
+CALIBRATION_PLAYBOOK = """\
+- hosts: all
+  gather_facts: false
+  tasks:
+    - ping:
+"""
+
+# Candidates within this fraction of the best throughput compete on CPU
+THROUGHPUT_TOLERANCE = 0.05
+
+
+@dataclass
+class TrialResult:
+    profile: TuningProfile
+    returncode: int
+    wall_seconds: float
+    cpu_seconds: float
+    hosts: int
+
+    @property
+    def throughput(self) -> float:
+        """Hosts processed per second of wall time."""
+        return self.hosts / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+
+class AutoTuner:
+    """
+    Measure calibration passes over a search space and pick the best profile.
+    """
+
+    def __init__(
+        self,
+        runner,
+        inventory: str,
+        forks: Sequence[int] = (5, 10, 25, 50),
+        strategies: Sequence[str] = ("linear", "free"),
+        pipelining: Sequence[bool] = (False, True),
+        calibration_playbook: Optional[str] = None,
+        trials: int = 1,
+    ):
+        self.runner = runner
+        self.inventory = inventory
+        self.forks = forks
+        self.strategies = strategies
+        self.pipelining = pipelining
+        self.calibration_playbook = calibration_playbook
+        self.trials = trials
+        try:
+            self.host_count = len(
+                parse_inventory_hosts(safe_join(str(runner.working_dir), inventory))
+            )
+        except (OSError, RunnerError, ValueError):
+            self.host_count = 0
+
+    def candidates(self) -> List[TuningProfile]:
+        """
+        Cartesian product of the search space. Forks above the host count
+        behave identically, so they collapse into a single candidate.
+        """
+        forks = sorted(
+            {min(f, self.host_count) if self.host_count else f for f in self.forks}
+        )
+        return [
+            TuningProfile(forks=f, strategy=s, pipelining=p)
+            for f, s, p in itertools.product(forks, self.strategies, self.pipelining)
+        ]
+
+    def _trial(
+        self, playbook: str, profile: TuningProfile, dry_run: bool
+    ) -> TrialResult:
+        cmd = self.runner._build_command(
+            playbook, self.inventory, dry_run=dry_run, profile=profile
+        )
+        env = self.runner._build_env(self.inventory, profile)
+        before = resource.getrusage(resource.RUSAGE_CHILDREN)
+        start = time.perf_counter()
+        proc = subprocess.run(
+            cmd,
+            cwd=self.runner.working_dir,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        wall = time.perf_counter() - start
+        after = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+        if proc.returncode != 0:
+            logger.warning(
+                "Calibration with %s failed (rc=%d): %s",
+                profile.model_dump(),
+                proc.returncode,
+                proc.stderr.strip()[-500:],
+            )
+        return TrialResult(profile, proc.returncode, wall, cpu, self.host_count or 1)
+
+    def _measure(self, playbook: str, dry_run: bool) -> List[TrialResult]:
+        candidates = self.candidates()
+        # Warm-up with the most forks: opens connections to every host quickly
+        warmup = max(candidates, key=lambda c: c.forks)
+        logger.info("Calibration warm-up pass with forks=%d", warmup.forks)
+        self._trial(playbook, warmup, dry_run)
+
+        trials: List[List[TrialResult]] = [[] for _ in candidates]
+        for _ in range(self.trials):
+            for i, profile in enumerate(candidates):
+                trials[i].append(self._trial(playbook, profile, dry_run))
+
+        results = []
+        for profile, passes in zip(candidates, trials):
+            # Keep the fastest of repeated passes to damp noise
+            best = min(passes, key=lambda t: (t.returncode != 0, t.wall_seconds))
+            logger.info(
+                "Calibration forks=%d strategy=%s pipelining=%s: "
+                "%.2fs wall, %.2fs cpu, %.1f hosts/s",
+                profile.forks,
+                profile.strategy,
+                profile.pipelining,
+                best.wall_seconds,
+                best.cpu_seconds,
+                best.throughput,
+            )
+            results.append(best)
+        return results
+
+    def run(self) -> Tuple[TuningProfile, List[TrialResult]]:
+        """
+        Run all calibration passes and return (best profile, all trial results).
+        Raises RunnerError if no candidate completed successfully.
+        """
+        if self.calibration_playbook:
+            results = self._measure(self.calibration_playbook, dry_run=True)
+        else:
+            fd, path = tempfile.mkstemp(
+                prefix=".autotune-", suffix=".yml", dir=self.runner.working_dir
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                    fh.write(CALIBRATION_PLAYBOOK)
+                results = self._measure(Path(path).name, dry_run=False)
+            finally:
+                os.unlink(path)
+
+        ok = [t for t in results if t.returncode == 0]
+        if not ok:
+            raise RunnerError("Auto-tune failed: no calibration pass succeeded")
+        top = max(t.throughput for t in ok)
+        near = [t for t in ok if t.throughput >= top * (1 - THROUGHPUT_TOLERANCE)]
+        best = min(near, key=lambda t: (t.cpu_seconds, t.wall_seconds))
+        logger.info(
+            "Auto-tune selected %s for %s", best.profile.model_dump(), self.inventory
+        )
+        return best.profile, results
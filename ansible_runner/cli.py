@@ -6,6 +6,13 @@ from __future__ import annotations
 import argparse
 
 
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Ansible Script Runner CLI (Enterprise Standard)",
@@ -41,4 +48,76 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Run playbook in dry-run (check) mode",
     )
+    parser.add_argument(
+        "--priority-class",
+        help="Resource priority class from config (e.g. interactive, bulk)",
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Show periodic progress frames on the console instead of every line",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only run roles/hosts whose inputs changed since the last success",
+    )
+    parser.add_argument(
+        "--force-full",
+        action="store_true",
+        help="With incremental mode, run everything and refresh fingerprints",
+    )
+    parser.add_argument(
+        "--workflow",
+        help="Workflow YAML describing dependent playbook jobs (runs as a DAG)",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=_positive_int,
+        help="Maximum workflow jobs running at once (overrides workflow file)",
+    )
+    parser.add_argument(
+        "--journal",
+        help="Append-only execution journal used to checkpoint the run",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Replay --journal and run only jobs that did not complete",
+    )
+    parser.add_argument(
+        "--kill-orphans",
+        action="store_true",
+        help="Terminate ansible-playbook processes orphaned by a previous run",
+    )
+    parser.add_argument(
+        "--preflight",
+        action="store_true",
+        help="Run cached syntax-check/list-hosts on all playbooks before running",
+    )
+    parser.add_argument(
+        "--clear-preflight-cache",
+        action="store_true",
+        help="Invalidate the preflight cache and exit",
+    )
+    parser.add_argument(
+        "--warm-ssh",
+        action="store_true",
+        help="Pre-open pooled SSH master connections to inventory hosts first",
+    )
+    parser.add_argument(
+        "--ssh-gc",
+        action="store_true",
+        help="Remove stale SSH control sockets from the pool and exit",
+    )
+    parser.add_argument(
+        "--warm-facts",
+        action="store_true",
+        help="Refresh the fact cache for the inventory in parallel shards and exit",
+    )
+    parser.add_argument(
+        "--autotune",
+        action="store_true",
+        help="Calibrate forks/strategy/pipelining for the inventory and save it",
+    )
     return parser.parse_args()
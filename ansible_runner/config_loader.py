@@ -3,19 +3,32 @@ Configuration loader using pydantic v2 for validation.
 Validates and provides a typed configuration object.
 """
 
-from pydantic import BaseModel, Field, ValidationError
-from typing import Dict, Any
+import json
+import os
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from typing import Dict, Any, List, Literal, Optional
 import yaml
 from pathlib import Path
 from .exceptions import ConfigValidationError
 
 
+class FactCacheConfig(BaseModel):
+    enabled: bool = False
+    # File-based cache plugin (one file per host), e.g. jsonfile
+    backend: str = "jsonfile"
+    path: str = ".cache/facts"
+    ttl_seconds: int = Field(default=86400, ge=0)
+    gathering: Literal["smart", "implicit", "explicit"] = "smart"
+    warm_shards: int = Field(default=4, ge=1)
+
+
 class AnsibleConfig(BaseModel):
     binary: str = Field(..., description="Path or name of ansible-playbook binary")
     default_playbook: str
     default_inventory: str
     default_extra_vars: Dict[str, Any] = {}
     working_dir: str = "."
+    fact_cache: FactCacheConfig = FactCacheConfig()
 
 
 class LoggingConfig(BaseModel):
@@ -23,17 +36,114 @@ class LoggingConfig(BaseModel):
     file: str = "logs/ansible_runner.log"
     max_bytes: int = 10 * 1024 * 1024
     backup_count: int = 5
+    console_mode: Literal["stream", "progress"] = "stream"
+    console_refresh_hz: float = Field(default=2.0, gt=0)
+
+
+class ResourcePolicy(BaseModel):
+    nice: Optional[int] = Field(default=None, ge=-20, le=19)
+    ionice_class: Optional[Literal["realtime", "best-effort", "idle"]] = None
+    ionice_level: Optional[int] = Field(default=None, ge=0, le=7)
+    rlimit_as: Optional[int] = Field(default=None, gt=0)  # bytes of address space
+    rlimit_nofile: Optional[int] = Field(default=None, gt=0)
+    # cgroup v2 group (relative to the cgroup mount) and files to write in it
+    cgroup: Optional[str] = None
+    cgroup_settings: Dict[str, str] = {}
+
+    @field_validator("cgroup")
+    @classmethod
+    def _cgroup_inside_mount(cls, value: Optional[str]) -> Optional[str]:
+        # The group is joined onto /sys/fs/cgroup and must not escape it
+        if value is not None:
+            parts = Path(value).parts
+            if not parts or Path(value).is_absolute() or ".." in parts:
+                raise ValueError(
+                    f"cgroup must be a relative path below the cgroup mount: {value!r}"
+                )
+        return value
+
+    @field_validator("cgroup_settings")
+    @classmethod
+    def _settings_are_group_files(cls, value: Dict[str, str]) -> Dict[str, str]:
+        # Each name is a file inside the group, e.g. cpu.weight
+        for name in value:
+            if not name or "/" in name or name in (".", ".."):
+                raise ValueError(
+                    f"cgroup_settings keys must be file names in the group: {name!r}"
+                )
+        return value
+
+
+def _default_priority_classes() -> Dict[str, ResourcePolicy]:
+    return {
+        "interactive": ResourcePolicy(
+            nice=0, ionice_class="best-effort", ionice_level=0
+        ),
+        "bulk": ResourcePolicy(nice=10, ionice_class="idle"),
+    }
 
 
 class RunnerConfig(BaseModel):
     timeout_seconds: int = 3600
     enable_async: bool = False
+    journal_fsync_every: int = 32
+    journal_fsync_interval: float = 1.0
+    spawn_mode: Literal["default", "fast"] = "default"
+    use_uvloop: bool = False
+    priority_classes: Dict[str, ResourcePolicy] = Field(
+        default_factory=_default_priority_classes
+    )
+    default_priority_class: Optional[str] = None
+
+
+class PreflightConfig(BaseModel):
+    enabled: bool = False
+    cache_dir: str = ".cache/preflight"
+    max_cache_bytes: int = 16 * 1024 * 1024
+    workers: int = 4
+
+
+class SSHConfig(BaseModel):
+    pool_enabled: bool = False
+    control_dir: str = "~/.ansible/cp-runner"
+    control_persist_seconds: int = 600
+    ssh_binary: str = "ssh"
+    connect_timeout: int = 10
+    prewarm_workers: int = 16
+
+
+class TuningProfile(BaseModel):
+    forks: int = Field(default=5, ge=1)
+    strategy: str = "linear"
+    pipelining: bool = False
+
+
+class TuningConfig(BaseModel):
+    # Pinned profiles per inventory; these win over measured ones
+    profiles: Dict[str, TuningProfile] = {}
+    # Best measured profile per inventory, written by --autotune
+    profiles_file: str = ".cache/tuning/profiles.json"
+    # Search space explored by calibration passes
+    forks: List[int] = [5, 10, 25, 50]
+    strategies: List[str] = ["linear", "free"]
+    pipelining: List[bool] = [False, True]
+    calibration_playbook: Optional[str] = None
+    trials: int = Field(default=1, ge=1)
+
+
+class IncrementalConfig(BaseModel):
+    enabled: bool = False
+    state_file: str = ".cache/incremental/state.json"
 
 
 class AppConfig(BaseModel):
     ansible: AnsibleConfig
     logging: LoggingConfig
     runner: RunnerConfig
+    preflight: PreflightConfig = PreflightConfig()
+    ssh: SSHConfig = SSHConfig()
+    tuning: TuningConfig = TuningConfig()
+    incremental: IncrementalConfig = IncrementalConfig()
 
 
 def load_config(path: str) -> AppConfig:
@@ -49,7 +159,41 @@ def load_config(path: str) -> AppConfig:
     try:
         raw = yaml.safe_load(content) or {}
         cfg = AppConfig.model_validate(raw)
+        measured = load_tuning_profiles(cfg.tuning.profiles_file)
+        cfg.tuning.profiles = {**measured, **cfg.tuning.profiles}
         return cfg
     except ValidationError as e:
         # Wrap pydantic's validation error for application-level handling
         raise ConfigValidationError(f"Invalid configuration: {e}") from e
+
+
+def load_tuning_profiles(path: str) -> Dict[str, TuningProfile]:
+    """
+    Read the measured tuning profiles written by --autotune. A missing file
+    yields no profiles. Raises ConfigValidationError if the file is corrupt.
+    """
+    p = Path(path)
+    try:
+        raw = json.loads(p.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as e:
+        raise ConfigValidationError(f"Cannot read tuning profiles {path}: {e}") from e
+    return {inv: TuningProfile.model_validate(data) for inv, data in raw.items()}
+
+
+def save_tuning_profile(path: str, inventory: str, profile: TuningProfile) -> None:
+    """
+    Persist `profile` as the measured tuning profile for `inventory` in the
+    profiles file at `path` (tuning.profiles_file). The config file itself is
+    never rewritten. Raises ConfigValidationError if the file is corrupt.
+    """
+    p = Path(path)
+    profiles = {
+        inv: data.model_dump() for inv, data in load_tuning_profiles(path).items()
+    }
+    profiles[inventory] = profile.model_dump()
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_suffix(".tmp")
+    tmp.write_text(json.dumps(profiles, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, p)
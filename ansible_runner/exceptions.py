@@ -25,3 +25,15 @@ class ProcessExecutionError(RunnerError):
         self.returncode = returncode
         self.stdout = stdout
         self.stderr = stderr
+
+
+class WorkflowError(RunnerError):
+    """Raised when a workflow file is invalid or its job graph cannot be scheduled."""
+
+    pass
+
+
+class PreflightError(RunnerError):
+    """Raised when syntax-check or host-list preflight fails for a playbook."""
+
+    pass
@@ -0,0 +1,180 @@
+"""
+Purpose: Persistent fact cache shared by all runs, with pre-warming and hit rates.
+
+Every run started by AnsibleRunner points ansible at the same file-based
+cache backend (jsonfile by default) through ANSIBLE_CACHE_PLUGIN* variables,
+with gathering=smart. Hosts whose cached facts are younger than the TTL then
+skip the setup step. The cache can be refreshed ahead of a deployment window
+by running `setup` against the inventory in parallel --limit shards.
+
+Each cache entry is one file per host (<prefix><inventory_hostname>). The
+per-run hit rate is read from these files, for the hosts the run targets
+(its plays after --limit, as listed by --list-hosts). A host is a hit if it
+had a fresh entry when the run started. It is a miss if it had none and its
+entry was written during the run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from ansible_runner.exceptions import ProcessExecutionError
+
+logger = logging.getLogger(__name__)
+
+# Set explicitly so entry file names do not depend on the ansible version
+FACT_PREFIX = "ansible_facts_"
+
+GATHER_PLAYBOOK = """\
+- hosts: all
+  gather_facts: false
+  tasks:
+    - setup:
+"""
+
+
+@dataclass
+class FactCacheStats:
+    hits: int
+    misses: int
+
+    @property
+    def total(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.total if self.total else 0.0
+
+
+@dataclass
+class ShardResult:
+    hosts: List[str]
+    returncode: int
+
+
+class FactCache:
+    """
+    A file-based fact cache directory shared by all ansible-playbook processes.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        backend: str = "jsonfile",
+        ttl_seconds: int = 86400,
+        gathering: str = "smart",
+    ):
+        # Absolute, so runs with a different cwd share the same cache
+        self.path = Path(path).expanduser().resolve()
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.gathering = gathering
+
+    def env(self) -> Dict[str, str]:
+        """Environment overrides that point ansible at the cache."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        return {
+            "ANSIBLE_CACHE_PLUGIN": self.backend,
+            "ANSIBLE_CACHE_PLUGIN_CONNECTION": str(self.path),
+            "ANSIBLE_CACHE_PLUGIN_PREFIX": FACT_PREFIX,
+            "ANSIBLE_CACHE_PLUGIN_TIMEOUT": str(self.ttl_seconds),
+            "ANSIBLE_GATHERING": self.gathering,
+        }
+
+    def entry_path(self, host: str) -> Path:
+        return self.path / f"{FACT_PREFIX}{host}"
+
+    def _mtime(self, host: str) -> Optional[float]:
+        try:
+            return self.entry_path(host).stat().st_mtime
+        except OSError:
+            return None
+
+    def _is_fresh(self, mtime: Optional[float], now: float) -> bool:
+        if mtime is None:
+            return False
+        return self.ttl_seconds <= 0 or now - mtime < self.ttl_seconds
+
+    def fresh_hosts(
+        self, hosts: Iterable[str], now: Optional[float] = None
+    ) -> Set[str]:
+        """Hosts with a cache entry younger than the TTL (0 = never expires)."""
+        now = time.time() if now is None else now
+        return {h for h in hosts if self._is_fresh(self._mtime(h), now)}
+
+    def snapshot(self, hosts: Iterable[str]) -> Dict[str, Optional[float]]:
+        """Entry mtimes (None if missing), taken just before a run starts."""
+        return {host: self._mtime(host) for host in hosts}
+
+    def stats(
+        self, before: Dict[str, Optional[float]], taken_at: float
+    ) -> FactCacheStats:
+        """
+        Hit/miss counts for a run, given the snapshot taken at `taken_at` of
+        the hosts it targets. Hosts that were not fresh and whose entry was
+        not rewritten during the run (skipped, unreachable) are not counted.
+        """
+        hits = misses = 0
+        for host, mtime in before.items():
+            if self._is_fresh(mtime, taken_at):
+                hits += 1
+            else:
+                current = self._mtime(host)
+                if current is not None and current != mtime:
+                    misses += 1
+        return FactCacheStats(hits, misses)
+
+
+def shard_hosts(hosts: List[str], shards: int) -> List[List[str]]:
+    """Split hosts round-robin into at most `shards` non-empty shards."""
+    count = max(1, min(shards, len(hosts)))
+    return [hosts[i::count] for i in range(count)]
+
+
+async def warm_facts(
+    runner, inventory: str, hosts: List[str], shards: int = 4
+) -> List[ShardResult]:
+    """
+    Run `setup` for `hosts` as parallel ansible-playbook runs, one per shard,
+    so every host gets a fresh cache entry. With no hosts (e.g. a dynamic
+    inventory), a single run covers the whole inventory.
+    """
+    fd, path = tempfile.mkstemp(
+        prefix=".warm-facts-", suffix=".yml", dir=runner.working_dir
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(GATHER_PLAYBOOK)
+        playbook = Path(path).name
+        groups = shard_hosts(hosts, shards) if hosts else [[]]
+
+        async def run_shard(shard: List[str]) -> ShardResult:
+            try:
+                rc = await runner.run_playbook_async(
+                    playbook, inventory, limit=",".join(shard) or None
+                )
+            except ProcessExecutionError as e:
+                rc = e.returncode
+            return ShardResult(shard, rc)
+
+        results = await asyncio.gather(*(run_shard(s) for s in groups))
+    finally:
+        os.unlink(path)
+
+    for i, result in enumerate(results, 1):
+        logger.info(
+            "Fact warm shard %d/%d: %s host(s), %s",
+            i,
+            len(results),
+            len(result.hosts) or "all",
+            "ok" if result.returncode == 0 else f"rc={result.returncode}",
+        )
+    return results
@@ -0,0 +1,320 @@
+"""
+Purpose: Incremental, change-aware runs that re-apply only roles whose inputs changed.
+
+Each (play hosts pattern, role) pair is fingerprinted from:
+- the role's files (and the files of its meta dependencies),
+- the role entry and the play's non-task settings (vars, become, ...),
+- the play's vars_files, the inventory, and group_vars for every group of
+  every host the play's pattern matches (parents and children included, as
+  resolved from a static inventory; the whole group_vars directories if the
+  inventory or pattern cannot be resolved),
+- the merged extra vars (config defaults + CLI).
+
+Tasks written directly in a play, the task files they include
+(include_tasks/import_tasks, recursively), the playbook directory's
+templates/ and files/, and roles pulled in with include_role or import_role
+are fingerprinted together under the pseudo-role "__play__".
+Each host's host_vars file or directory gets its own fingerprint
+("<host>::__host_vars__"), so editing one host's vars only re-runs that host.
+
+Fingerprints from the last successful run are stored in a JSON state file.
+The next run compares against them and passes --limit with the host
+patterns (and hosts) whose inputs changed. Ansible applies "!" and "&" terms
+to the whole --limit, so if any changed pattern contains one, no --limit is
+passed. --tags with the changed role names is passed only when each changed
+role is applied with a tag equal to its name (`- {role: nginx, tags:
+[nginx]}`) and no host_vars changed. Otherwise all tasks run for the limited
+hosts.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import yaml
+
+from ansible_runner.preflight import hash_paths
+from ansible_runner.utils import parse_inventory_groups
+from ansible_runner.project import (
+    TASK_SECTIONS,
+    iter_playbooks,
+    load_yaml,
+    play_task_files,
+    role_names,
+    role_search,
+    role_tree,
+    roles_in_tasks,
+    vars_files,
+)
+
+logger = logging.getLogger(__name__)
+
+PLAY_TASKS = "__play__"
+HOST_VARS = "__host_vars__"
+_MATCH_ALL = {"all", "*", ""}
+
+
+@dataclass
+class RoleFingerprint:
+    hosts: str
+    role: str
+    digest: str
+    taggable: bool
+
+    @property
+    def key(self) -> str:
+        return f"{self.hosts}::{self.role}"
+
+
+@dataclass
+class IncrementalPlan:
+    changed: List[str]
+    tags: Optional[List[str]] = None
+    limit: Optional[str] = None
+
+    @property
+    def up_to_date(self) -> bool:
+        return not self.changed
+
+
+def _static_host_groups(inventory: Optional[Path]) -> Optional[Dict[str, Set[str]]]:
+    """{host: groups} of a static inventory; None if it cannot be resolved."""
+    if inventory is None or not inventory.exists():
+        return None
+    files = [f for f in inventory.iterdir()] if inventory.is_dir() else [inventory]
+    if any(f.is_file() and os.access(f, os.X_OK) for f in files):
+        return None
+    try:
+        return parse_inventory_groups(str(inventory))
+    except (OSError, UnicodeDecodeError, ValueError, yaml.YAMLError):
+        return None
+
+
+def _play_groups(
+    pattern: str, host_groups: Optional[Dict[str, Set[str]]]
+) -> Optional[Set[str]]:
+    """
+    Every group whose group_vars apply to a host matched by `pattern`.
+    None if the pattern uses wildcards/regexes or names an unknown group.
+    """
+    if host_groups is None:
+        return None
+    known = set().union(*host_groups.values()) if host_groups else {"all"}
+    matched: Set[str] = set()
+    for part in pattern.replace(":", ",").split(","):
+        # Intersections/exclusions only shrink the match: count every term
+        part = part.strip().lstrip("&!")
+        if not part:
+            continue
+        if part == "*" or part == "all":
+            part = "all"
+        elif any(c in part for c in "*?[~"):
+            return None
+        if part in host_groups:
+            matched.add(part)
+        elif part in known:
+            matched.update(h for h, groups in host_groups.items() if part in groups)
+        else:
+            return None
+    groups = {"all"}
+    for host in matched:
+        groups |= host_groups[host]
+    return groups
+
+
+def _vars_paths(base: Path, kind: str, name: str) -> List[Path]:
+    root = base / kind
+    return [root / name, *(root / f"{name}{ext}" for ext in (".yml", ".yaml", ".json"))]
+
+
+def _host_vars(bases: List[Path]) -> Dict[str, List[Path]]:
+    """host_vars files/directories per host name across `bases`."""
+    hosts: Dict[str, List[Path]] = {}
+    for base in bases:
+        root = base / "host_vars"
+        if not root.is_dir():
+            continue
+        for entry in sorted(root.iterdir()):
+            host = entry.name
+            if entry.is_file() and entry.suffix in (".yml", ".yaml", ".json"):
+                host = entry.stem
+            hosts.setdefault(host, []).append(entry)
+    return hosts
+
+
+def _is_tagged_with_name(entry, name: str) -> bool:
+    if not isinstance(entry, dict):
+        return False
+    tags = entry.get("tags") or []
+    if isinstance(tags, str):
+        tags = [t.strip() for t in tags.split(",")]
+    return name in tags
+
+
+def _canonical(data) -> str:
+    return json.dumps(data, sort_keys=True, default=str)
+
+
+def fingerprint_roles(
+    working_dir: Path,
+    playbook: str,
+    inventory: Optional[str] = None,
+    extra_vars: Optional[dict] = None,
+) -> Dict[str, RoleFingerprint]:
+    """
+    Return fingerprints keyed by "<hosts pattern>::<role>" for every role
+    applied by `playbook` (following import_playbook).
+    """
+    fingerprints: Dict[str, RoleFingerprint] = {}
+    inv_bases: List[Path] = []
+    inv_paths: List[Path] = []
+    inv: Optional[Path] = None
+    if inventory:
+        inv = working_dir / inventory
+        inv_bases.append(inv if inv.is_dir() else inv.parent)
+        inv_paths.append(inv)
+    host_groups = _static_host_groups(inv)
+    extra = _canonical(extra_vars or {})
+    vars_bases: List[Path] = list(inv_bases)
+
+    def add(fp: RoleFingerprint) -> None:
+        existing = fingerprints.get(fp.key)
+        if existing is not None:
+            # Same role on the same hosts in several plays: combine them
+            fp.digest = hashlib.sha256(
+                (existing.digest + fp.digest).encode()
+            ).hexdigest()
+            fp.taggable = fp.taggable and existing.taggable
+        fingerprints[fp.key] = fp
+
+    for path, plays in iter_playbooks(working_dir, playbook):
+        bases = list(dict.fromkeys([path.parent, *inv_bases]))
+        vars_bases.extend(bases)
+        search = role_search(working_dir, path)
+        for play in plays:
+            if "hosts" not in play:
+                continue
+            hosts = play["hosts"]
+            hosts = ",".join(hosts) if isinstance(hosts, list) else str(hosts)
+
+            common: List[Path] = [*inv_paths, *vars_files(play, path)]
+            groups = _play_groups(hosts, host_groups)
+            for base in bases:
+                if groups is None:
+                    common.append(base / "group_vars")
+                    continue
+                for group in sorted(groups):
+                    common.extend(_vars_paths(base, "group_vars", group))
+            settings = {
+                k: v for k, v in play.items() if k not in (*TASK_SECTIONS, "roles")
+            }
+            salt = extra + _canonical(settings)
+
+            roles = play.get("roles")
+            for entry in roles if isinstance(roles, list) else []:
+                names = role_names([entry])
+                if not names:
+                    continue
+                name = names.pop()
+                add(
+                    RoleFingerprint(
+                        hosts=hosts,
+                        role=name,
+                        digest=hash_paths(
+                            [*role_tree(name, search), *common],
+                            working_dir,
+                            salt + _canonical(entry),
+                        ),
+                        taggable=_is_tagged_with_name(entry, name),
+                    )
+                )
+
+            tasks = {s: play[s] for s in TASK_SECTIONS if play.get(s)}
+            if tasks:
+                task_paths = play_task_files(play, path)
+                task_roles: Set[str] = set()
+                for section in tasks.values():
+                    task_roles |= roles_in_tasks(section)
+                for task_path in task_paths:
+                    task_roles |= roles_in_tasks(load_yaml(task_path))
+                included: List[Path] = [
+                    *task_paths,
+                    path.parent / "templates",
+                    path.parent / "files",
+                ]
+                seen: Set[Path] = set()
+                for name in sorted(task_roles):
+                    included.extend(role_tree(name, search, seen))
+                add(
+                    RoleFingerprint(
+                        hosts=hosts,
+                        role=PLAY_TASKS,
+                        digest=hash_paths(
+                            [*included, *common], working_dir, salt + _canonical(tasks)
+                        ),
+                        taggable=False,
+                    )
+                )
+
+    for host, paths in _host_vars(list(dict.fromkeys(vars_bases))).items():
+        fp = RoleFingerprint(
+            hosts=host,
+            role=HOST_VARS,
+            digest=hash_paths(paths, working_dir),
+            taggable=False,
+        )
+        fingerprints[fp.key] = fp
+    return fingerprints
+
+
+def plan_run(
+    current: Dict[str, RoleFingerprint], previous: Dict[str, str]
+) -> IncrementalPlan:
+    """Compare fingerprints against the last successful run's and build a plan."""
+    changed = [k for k, fp in current.items() if previous.get(k) != fp.digest]
+    # A deleted host_vars entry changes that host's variables as well
+    removed = [k for k in previous if k not in current and k.endswith(f"::{HOST_VARS}")]
+    if not changed and not removed:
+        return IncrementalPlan(changed=[])
+    fps = [current[k] for k in changed]
+    patterns = sorted(
+        {fp.hosts for fp in fps} | {k.rsplit("::", 1)[0] for k in removed}
+    )
+    tags = None
+    if not removed and all(fp.taggable for fp in fps):
+        tags = sorted({fp.role for fp in fps})
+    limit = None
+    # "!"/"&" terms would apply to every other pattern in the same --limit
+    if not any(p.strip() in _MATCH_ALL or any(c in p for c in "!&") for p in patterns):
+        limit = ",".join(patterns)
+    return IncrementalPlan(changed=changed + removed, tags=tags, limit=limit)
+
+
+class IncrementalState:
+    """JSON file of fingerprints from the last successful run of each playbook."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def previous(self, run_key: str) -> Dict[str, str]:
+        return self._load().get(run_key, {})
+
+    def save(self, run_key: str, fingerprints: Dict[str, RoleFingerprint]) -> None:
+        data = self._load()
+        data[run_key] = {k: fp.digest for k, fp in fingerprints.items()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
@@ -0,0 +1,301 @@
+"""
+Purpose: Append-only execution journal for checkpointed, resumable batches.
+
+Each line of the journal is a JSON record describing a job event:
+
+    {"event": "submit",   "job": "db", "ts": ...}
+    {"event": "start",    "job": "db", "pid": 4242, "ts": ...}
+    {"event": "complete", "job": "db", "rc": 0, "ts": ...}
+
+Each controller that opens the journal first writes a "session" record with
+its pid and holds an exclusive flock on the file until it closes it, so two
+controllers can never append to the same journal.
+
+Records are flushed to the OS on every write, so a controller crash loses
+nothing. fsync is batched (every N records or T seconds), so a power loss
+can drop at most the last batch. Those jobs are then re-run, which is safe
+because playbooks are idempotent.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ansible_runner.exceptions import RunnerError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JournalState:
+    """State of a batch reconstructed by replaying its journal."""
+
+    submitted: List[str] = field(default_factory=list)
+    running: Dict[str, Optional[int]] = field(default_factory=dict)
+    completed: Dict[str, int] = field(default_factory=dict)
+    controller_pid: Optional[int] = None
+
+    def apply(self, record: dict) -> None:
+        event = record.get("event")
+        if event == "session":
+            self.controller_pid = record.get("pid")
+            return
+        job = record.get("job")
+        if not isinstance(job, str):
+            return
+        if event == "submit" and job not in self.submitted:
+            self.submitted.append(job)
+        elif event == "start":
+            self.running[job] = record.get("pid")
+            self.completed.pop(job, None)
+        elif event == "complete":
+            self.running.pop(job, None)
+            self.completed[job] = int(record.get("rc", 1))
+
+    def is_done(self, job: str) -> bool:
+        """A job is done only if its last completion succeeded."""
+        return self.completed.get(job) == 0
+
+    def incomplete(self) -> List[str]:
+        return [job for job in self.submitted if not self.is_done(job)]
+
+
+@dataclass
+class Orphan:
+    job: str
+    pid: int
+
+
+def replay_journal(path: str | Path) -> JournalState:
+    """
+    Rebuild JournalState from `path`. A missing file yields an empty state;
+    a torn trailing line (crash mid-write) is ignored.
+    """
+    state = JournalState()
+    p = Path(path)
+    if not p.exists():
+        return state
+    with p.open(encoding="utf-8") as fh:
+        for lineno, line in enumerate(fh, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                state.apply(json.loads(line))
+            except (json.JSONDecodeError, TypeError, ValueError):
+                logger.warning("Ignoring corrupt journal record %s:%d", p, lineno)
+    return state
+
+
+class ExecutionJournal:
+    """
+    Append-only journal of job submissions, starts and completions.
+
+    Replays any existing file on open so `state` reflects the previous run.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        fsync_every: int = 32,
+        fsync_interval: float = 1.0,
+    ):
+        self.path = Path(path)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.path.open("a", encoding="utf-8")
+        try:
+            fcntl.flock(self._fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._fh.close()
+            owner = replay_journal(self.path).controller_pid
+            raise RunnerError(
+                f"Journal {self.path} is in use by another controller"
+                + (f" (pid {owner})" if owner else "")
+            ) from None
+        self.state = replay_journal(self.path)
+        # Controller that wrote the previous session, if any
+        self.previous_controller = self.state.controller_pid
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._append({"event": "session", "pid": os.getpid()})
+
+    def submit(self, job: str) -> None:
+        self._append({"event": "submit", "job": job})
+
+    def start(self, job: str, pid: Optional[int]) -> None:
+        self._append({"event": "start", "job": job, "pid": pid})
+
+    def complete(self, job: str, rc: int) -> None:
+        self._append({"event": "complete", "job": job, "rc": rc})
+
+    def sync(self) -> None:
+        """Force pending records to stable storage."""
+        with self._lock:
+            self._sync_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh.closed:
+                return
+            self._sync_locked()
+            self._fh.close()
+
+    def __enter__(self) -> "ExecutionJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _append(self, record: dict) -> None:
+        record["ts"] = time.time()
+        with self._lock:
+            self.state.apply(record)
+            self._fh.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._fh.flush()
+            self._unsynced += 1
+            if (
+                self._unsynced >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync_locked()
+
+    def _sync_locked(self) -> None:
+        if self._unsynced:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+            self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    # A zombie has exited; it only waits to be reaped by its parent
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return True
+    return stat.rpartition(")")[2].split()[:1] != ["Z"]
+
+
+def _pid_cmdline(pid: int) -> Optional[str]:
+    try:
+        raw = Path(f"/proc/{pid}/cmdline").read_bytes()
+    except OSError:
+        return None
+    return raw.replace(b"\0", b" ").decode(errors="replace")
+
+
+def find_orphans(state: JournalState, binary: str = "ansible-playbook") -> List[Orphan]:
+    """
+    Return jobs that were started by a previous controller, never completed,
+    and whose ansible-playbook process is still alive.
+    """
+    name = os.path.basename(binary)
+    orphans = []
+    for job, pid in state.running.items():
+        if not pid or pid == os.getpid() or not _pid_alive(pid):
+            continue
+        cmdline = _pid_cmdline(pid)
+        # Guard against PID reuse where /proc lets us check the command line
+        if cmdline is not None and name not in cmdline:
+            continue
+        orphans.append(Orphan(job=job, pid=pid))
+    return orphans
+
+
+def _wait_exited(orphans: List[Orphan], timeout: float) -> List[Orphan]:
+    deadline = time.monotonic() + timeout
+    alive = orphans
+    while alive and time.monotonic() < deadline:
+        time.sleep(0.05)
+        alive = [o for o in alive if _pid_alive(o.pid)]
+    return alive
+
+
+def terminate_orphans(orphans: List[Orphan], timeout: float = 30.0) -> None:
+    """
+    Stop orphaned processes left by a previous controller: SIGTERM, then
+    SIGKILL for any still running after `timeout` seconds. Returns only once
+    all of them have exited. Raises RunnerError if one cannot be stopped.
+    """
+    for orphan in orphans:
+        try:
+            os.kill(orphan.pid, signal.SIGTERM)
+            logger.warning(
+                "Terminated orphaned job '%s' (pid %d)", orphan.job, orphan.pid
+            )
+        except ProcessLookupError:
+            pass
+    alive = _wait_exited(orphans, timeout)
+    for orphan in alive:
+        logger.warning("Killing orphaned job '%s' (pid %d)", orphan.job, orphan.pid)
+        try:
+            os.kill(orphan.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    alive = _wait_exited(alive, 5.0)
+    if alive:
+        listing = ", ".join(f"{o.job} (pid {o.pid})" for o in alive)
+        raise RunnerError(f"Orphaned processes did not exit: {listing}")
+
+
+def open_journal(
+    path: str,
+    resume: bool,
+    binary: str = "ansible-playbook",
+    kill_orphans: bool = False,
+    fsync_every: int = 32,
+    fsync_interval: float = 1.0,
+) -> ExecutionJournal:
+    """
+    Open the journal for a batch. An existing journal is only reused with
+    `resume`, and never while another controller holds it open; orphaned
+    children from the previous controller must be gone
+    (or be terminated with `kill_orphans`) before jobs are re-run.
+    Raises RunnerError otherwise.
+    """
+    if Path(path).exists() and not resume:
+        raise RunnerError(f"Journal already exists: {path} (use --resume or remove it)")
+    journal = ExecutionJournal(path, fsync_every, fsync_interval)
+    if not resume:
+        return journal
+
+    orphans = find_orphans(journal.state, binary)
+    if orphans and not kill_orphans:
+        journal.close()
+        listing = ", ".join(f"{o.job} (pid {o.pid})" for o in orphans)
+        raise RunnerError(
+            f"Orphaned ansible-playbook processes still running: {listing} "
+            "(wait for them or use --kill-orphans)"
+        )
+    try:
+        terminate_orphans(orphans)
+    except RunnerError:
+        journal.close()
+        raise
+
+    done = [job for job in journal.state.submitted if journal.state.is_done(job)]
+    logger.info(
+        "Resuming from journal %s: %d job(s) already completed, %d incomplete",
+        path,
+        len(done),
+        len(journal.state.incomplete()),
+    )
+    return journal
@@ -0,0 +1,105 @@
+"""
+Purpose: Apply per-run resource policy (priority classes) to ansible-playbook.
+
+The policy is applied to the child right after it is spawned: nice level,
+ionice class, RLIMIT_AS/RLIMIT_NOFILE and an optional cgroup v2 placement.
+ansible-playbook forks its workers only after parsing the playbook, so the
+whole process tree inherits the policy. Doing this after the spawn instead
+of in a preexec_fn keeps the posix_spawn path (see spawn.py) available.
+
+apply_policy blocks (it runs the `ionice` binary), so async callers run it
+in a worker thread.
+
+Every setting is best effort. If one fails (missing privileges, no cgroup
+v2, no `ionice` binary), a warning is logged and the run continues.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import resource
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+from ansible_runner.config_loader import ResourcePolicy
+
+logger = logging.getLogger(__name__)
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+_IONICE_CLASSES = {"realtime": "1", "best-effort": "2", "idle": "3"}
+
+
+def _set_rlimit(pid: int, which: int, limit: int) -> None:
+    # Soft and hard are both lowered so the playbook cannot raise them again
+    _, hard = resource.prlimit(pid, which)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.prlimit(pid, which, (limit, limit))
+
+
+def _set_ionice(pid: int, policy: ResourcePolicy) -> None:
+    if policy.ionice_class is None:
+        return
+    ionice = shutil.which("ionice")
+    if ionice is None:
+        logger.warning("ionice not found; skipping I/O priority for pid %d", pid)
+        return
+    cmd = [ionice, "-c", _IONICE_CLASSES[policy.ionice_class]]
+    if policy.ionice_level is not None and policy.ionice_class != "idle":
+        cmd.extend(["-n", str(policy.ionice_level)])
+    cmd.extend(["-p", str(pid)])
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        logger.warning("ionice failed for pid %d: %s", pid, proc.stderr.strip())
+
+
+def _place_in_cgroup(pid: int, policy: ResourcePolicy, cgroup_root: str) -> None:
+    if not policy.cgroup:
+        return
+    root = Path(cgroup_root)
+    if not (root / "cgroup.controllers").exists():
+        logger.warning("cgroup v2 not available at %s; skipping placement", root)
+        return
+    group = root / policy.cgroup
+    group.mkdir(parents=True, exist_ok=True)
+    for name, value in policy.cgroup_settings.items():
+        (group / name).write_text(str(value))
+    (group / "cgroup.procs").write_text(str(pid))
+    logger.debug("Placed pid %d in cgroup %s", pid, group)
+
+
+def _attempt(name: str, pid: int, func, *args) -> None:
+    try:
+        func(*args)
+    except (OSError, ValueError) as e:
+        logger.warning("Could not apply %s to pid %d: %s", name, pid, e)
+
+
+def apply_policy(
+    pid: int, policy: Optional[ResourcePolicy], cgroup_root: str = CGROUP_ROOT
+) -> None:
+    """Apply `policy` to the process `pid` (and thereby its future children)."""
+    if policy is None:
+        return
+    if policy.nice is not None:
+        _attempt("nice", pid, os.setpriority, os.PRIO_PROCESS, pid, policy.nice)
+    if policy.rlimit_as is not None:
+        _attempt(
+            "RLIMIT_AS", pid, _set_rlimit, pid, resource.RLIMIT_AS, policy.rlimit_as
+        )
+    if policy.rlimit_nofile is not None:
+        _attempt(
+            "RLIMIT_NOFILE",
+            pid,
+            _set_rlimit,
+            pid,
+            resource.RLIMIT_NOFILE,
+            policy.rlimit_nofile,
+        )
+    if policy.ionice_class is not None:
+        _attempt("ionice", pid, _set_ionice, pid, policy)
+    if policy.cgroup:
+        _attempt("cgroup", pid, _place_in_cgroup, pid, policy, cgroup_root)
@@ -3,13 +3,153 @@ Logging configuration for Ansible Script Runner.
 
 Must use rotating file handler for production readiness.
 Contains a get_logger() factory to avoid global state issues.
+
+Console output has two modes:
+- "stream": every log record is written to the console (default).
+- "progress": streamed ansible-playbook output is coalesced into periodic
+  progress frames (host states, current task, lines/s), capped at a
+  refresh rate. Streamed lines at WARNING or above (ansible's stderr) are
+  still written as-is. Full detail still goes to the file sink.
 """
 
 from logging import Logger, getLogger, Formatter, INFO
 from logging.handlers import RotatingFileHandler
 import logging
 import os
-from typing import Optional
+import re
+import time
+from typing import Dict, Optional
+
+# Pass as `extra=` when logging a line of ansible-playbook output
+STREAM_EXTRA = {"ansible_stream": True}
+
+_TASK_RE = re.compile(r"^TASK \[(?P<task>.*)\]")
+_HOST_RE = re.compile(
+    r"^(?P<state>ok|changed|failed|fatal): \[(?P<host>[^\]]+?)(?: -> [^\]]+)?\]"
+)
+# Later states win: a host that failed once stays failed for the run
+_SEVERITY = {"ok": 0, "changed": 1, "failed": 2, "unreachable": 3}
+_MAX_LISTED_HOSTS = 20
+
+
+class ProgressConsoleHandler(logging.StreamHandler):
+    """
+    Console handler that aggregates ansible-playbook output into progress frames.
+
+    Records logged with STREAM_EXTRA update per-host state and are rendered
+    at most `refresh_hz` times per second; all other records pass through.
+    """
+
+    def __init__(self, stream=None, refresh_hz: float = 2.0):
+        super().__init__(stream)
+        self.min_interval = 1.0 / refresh_hz if refresh_hz > 0 else 0.0
+        self.hosts: Dict[str, str] = {}
+        self.task = ""
+        self.lines = 0
+        self._lines_at_render = 0
+        self._last_render = time.monotonic()
+        self._last_failure: Optional[tuple] = None
+        self._frame_on_line = False
+        self._dirty = False
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys(_SEVERITY, 0)
+        for state in self.hosts.values():
+            counts[state] += 1
+        return counts
+
+    def _update(self, line: str) -> None:
+        self.lines += 1
+        task = _TASK_RE.match(line)
+        if task:
+            self.task = task.group("task")
+            return
+        if line == "...ignoring" and self._last_failure:
+            # Failure was ignored by the play: restore the host's prior state
+            host, previous = self._last_failure
+            if previous is None:
+                self.hosts.pop(host, None)
+            else:
+                self.hosts[host] = previous
+            self._last_failure = None
+            return
+        match = _HOST_RE.match(line)
+        if not match:
+            return
+        host = match.group("host")
+        state = match.group("state")
+        if state == "fatal":
+            state = "unreachable" if "UNREACHABLE!" in line else "failed"
+        previous = self.hosts.get(host)
+        if state in ("failed", "unreachable"):
+            self._last_failure = (host, previous)
+        if previous is None or _SEVERITY[state] > _SEVERITY[previous]:
+            self.hosts[host] = state
+
+    def render(self) -> str:
+        now = time.monotonic()
+        elapsed = now - self._last_render
+        rate = (self.lines - self._lines_at_render) / elapsed if elapsed > 0 else 0.0
+        self._last_render = now
+        self._lines_at_render = self.lines
+        c = self.counts()
+        return (
+            f"[progress] task: {self.task or '-'} | ok={c['ok']} "
+            f"changed={c['changed']} failed={c['failed']} "
+            f"unreachable={c['unreachable']} | {self.lines} lines ({rate:.0f}/s)"
+        )
+
+    def _write_frame(self, final: bool = False) -> None:
+        frame = self.render()
+        if self.stream.isatty() and not final:
+            # Redraw in place on terminals
+            self.stream.write("\r\x1b[K" + frame)
+            self._frame_on_line = True
+        else:
+            self._end_frame_line()
+            self.stream.write(frame + self.terminator)
+        self.stream.flush()
+        self._dirty = False
+
+    def _end_frame_line(self) -> None:
+        if self._frame_on_line:
+            self.stream.write("\r\x1b[K")
+            self._frame_on_line = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Only stdout is aggregated; errors and warnings must stay visible
+        aggregate = getattr(record, "ansible_stream", False)
+        if not aggregate or record.levelno >= logging.WARNING:
+            try:
+                self._end_frame_line()
+            except Exception:
+                self.handleError(record)
+            super().emit(record)
+            return
+        try:
+            self._update(record.getMessage())
+            self._dirty = True
+            if time.monotonic() - self._last_render >= self.min_interval:
+                self._write_frame()
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            if self._dirty and self.stream and not self.stream.closed:
+                self._write_frame(final=True)
+                for state in ("failed", "unreachable"):
+                    names = [h for h, s in self.hosts.items() if s == state]
+                    if names:
+                        more = len(names) - _MAX_LISTED_HOSTS
+                        listed = ", ".join(names[:_MAX_LISTED_HOSTS])
+                        suffix = f" (+{more} more)" if more > 0 else ""
+                        self.stream.write(f"[progress] {state}: {listed}{suffix}\n")
+                self.stream.flush()
+        finally:
+            self.release()
+            super().close()
 
 
 def get_logger(
@@ -18,6 +158,8 @@ def get_logger(
     logfile: Optional[str] = None,
     max_bytes: int = 10 * 1024 * 1024,
     backup_count: int = 5,
+    console_mode: str = "stream",
+    refresh_hz: float = 2.0,
 ) -> Logger:
     """
     Return a configured logger instance using RotatingFileHandler.
@@ -30,7 +172,11 @@ def get_logger(
     if not logger.handlers:
         fmt = Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
         # Console handler
-        console = logging.StreamHandler()
+        console: logging.StreamHandler
+        if console_mode == "progress":
+            console = ProgressConsoleHandler(refresh_hz=refresh_hz)
+        else:
+            console = logging.StreamHandler()
         console.setFormatter(fmt)
         logger.addHandler(console)
 
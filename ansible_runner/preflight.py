@@ -0,0 +1,193 @@
+"""
+Purpose: Preflight checks (--syntax-check / --list-hosts) with a content-hash cache.
+
+The cache key hashes everything the checks depend on: the playbook and any
+playbooks it imports, task files loaded with import_tasks/include_tasks,
+the roles it references (and their dependencies), vars files,
+group_vars/host_vars, the inventory and ansible.cfg (see project.py for
+how roles are resolved). If none of these change, a later
+preflight is served from the on-disk cache and no ansible-playbook process
+is started.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+
+from ansible_runner.project import (
+    ansible_cfg_path,
+    iter_playbooks,
+    play_roles,
+    play_task_files,
+    role_search,
+    vars_files,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PreflightResult:
+    playbook: str
+    inventory: Optional[str]
+    syntax_ok: bool
+    hosts: List[str] = field(default_factory=list)
+    error: str = ""
+    cached: bool = False
+
+
+def parse_list_hosts(output: str) -> List[str]:
+    """
+    Extract host names from `ansible-playbook --list-hosts` output.
+    Hosts are listed, indented, under each play's "hosts (N):" line.
+    """
+    hosts: List[str] = []
+    indent: Optional[int] = None
+    for line in output.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        current = len(line) - len(line.lstrip())
+        if stripped.startswith("hosts (") and stripped.endswith(":"):
+            indent = current
+            continue
+        if indent is not None and current > indent:
+            if stripped not in hosts:
+                hosts.append(stripped)
+        else:
+            indent = None
+    return hosts
+
+
+def collect_inputs(
+    working_dir: Path, playbook: str, inventory: Optional[str] = None
+) -> List[Path]:
+    """
+    Return every file and directory that preflight results depend on.
+    Unparseable playbooks contribute only themselves (the syntax check
+    will report them).
+    """
+    inputs: List[Path] = []
+    for path, plays in iter_playbooks(working_dir, playbook):
+        inputs.append(path)
+        for vars_dir in ("group_vars", "host_vars"):
+            inputs.append(path.parent / vars_dir)
+        search = role_search(working_dir, path)
+        for play in plays:
+            inputs.extend(play_task_files(play, path))
+            inputs.extend(play_roles(play, search, path))
+            inputs.extend(vars_files(play, path))
+    if inventory:
+        inv = working_dir / inventory
+        inputs.append(inv)
+        inv_dir = inv if inv.is_dir() else inv.parent
+        for vars_dir in ("group_vars", "host_vars"):
+            inputs.append(inv_dir / vars_dir)
+    cfg_path = ansible_cfg_path(working_dir)
+    if cfg_path is not None:
+        inputs.append(cfg_path)
+    return inputs
+
+
+def hash_paths(paths: Iterable[Path], base: Path, salt: str = "") -> str:
+    """
+    Hash the names (relative to `base`) and contents of the given files,
+    recursing into directories. Missing paths are simply absent from the hash.
+    """
+    digest = hashlib.sha256(salt.encode())
+    files: Set[Path] = set()
+    for entry in paths:
+        if entry.is_dir():
+            files.update(p for p in entry.rglob("*") if p.is_file())
+        elif entry.is_file():
+            files.add(entry)
+    for path in sorted(files):
+        # Relative names keep keys stable if the checkout is moved
+        digest.update(os.path.relpath(path, base).encode() + b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def content_hash(
+    working_dir: Path,
+    playbook: str,
+    inventory: Optional[str] = None,
+    salt: str = "",
+) -> str:
+    """
+    Hash the names and contents of all preflight inputs into a cache key.
+    Missing optional inputs (e.g. no host_vars) are simply absent from the hash.
+    """
+    inputs = collect_inputs(working_dir, playbook, inventory)
+    return hash_paths(inputs, working_dir, salt)
+
+
+class PreflightCache:
+    """
+    Size-bounded on-disk cache of preflight results (one JSON file per key).
+    Least recently used entries are evicted once `max_bytes` is exceeded.
+    """
+
+    def __init__(self, cache_dir: str | Path, max_bytes: int = 16 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self._entry(key)
+        try:
+            data = json.loads(entry.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        # Touch so eviction keeps recently used entries
+        os.utime(entry)
+        return data
+
+    def put(self, key: str, data: dict) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self._entry(key).with_suffix(".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, self._entry(key))
+        self.prune()
+
+    def prune(self) -> None:
+        entries = []
+        for p in self.cache_dir.glob("*.json"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> int:
+        """Remove every cached entry. Returns the number of entries removed."""
+        removed = 0
+        for p in self.cache_dir.glob("*.json"):
+            p.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+
+def result_to_cache(result: PreflightResult) -> dict:
+    data = asdict(result)
+    data.pop("cached")
+    return data
+
+
+def result_from_cache(data: dict) -> PreflightResult:
+    return PreflightResult(**data, cached=True)
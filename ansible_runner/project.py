@@ -0,0 +1,263 @@
+"""
+Purpose: Read the structure of an Ansible project without running ansible.
+
+Shared by preflight (cache keys) and incremental runs (per-role fingerprints):
+- ansible.cfg discovery and option lookup, and the effective roles_path,
+- walking a playbook and the playbooks it imports,
+- following include_tasks/import_tasks to the task files they load,
+- resolving role names (play roles, include_role/import_role in tasks, and
+  meta dependencies) to role directories.
+
+Roles are looked up like ansible does: roles/ next to the playbook, then
+roles_path (ANSIBLE_ROLES_PATH, else ansible.cfg, else ansible's default).
+"""
+
+from __future__ import annotations
+
+import configparser
+import logging
+import os
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Set, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+TASK_SECTIONS = ("tasks", "pre_tasks", "post_tasks", "handlers")
+ROLE_ACTIONS = (
+    "include_role",
+    "import_role",
+    "ansible.builtin.include_role",
+    "ansible.builtin.import_role",
+)
+TASK_INCLUDES = (
+    "include_tasks",
+    "import_tasks",
+    "ansible.builtin.include_tasks",
+    "ansible.builtin.import_tasks",
+)
+PLAYBOOK_IMPORTS = ("import_playbook", "ansible.builtin.import_playbook")
+DEFAULT_ROLES_PATH = "~/.ansible/roles:/usr/share/ansible/roles:/etc/ansible/roles"
+
+
+def load_yaml(path: Path) -> Any:
+    """Parse a YAML file; None if it is missing or invalid."""
+    try:
+        return yaml.safe_load(path.read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError, yaml.YAMLError):
+        return None
+
+
+def ansible_cfg_path(working_dir: Path) -> Optional[Path]:
+    """The ansible.cfg ansible-playbook would read when run in `working_dir`."""
+    candidates = [working_dir / "ansible.cfg", Path("~/.ansible.cfg").expanduser()]
+    if os.environ.get("ANSIBLE_CONFIG"):
+        env_cfg = Path(os.environ["ANSIBLE_CONFIG"]).expanduser()
+        candidates.insert(0, working_dir / env_cfg)
+    candidates.append(Path("/etc/ansible/ansible.cfg"))
+    for path in candidates:
+        path = path / "ansible.cfg" if path.is_dir() else path
+        if path.is_file():
+            return path
+    return None
+
+
+def ansible_cfg_option(working_dir: Path, section: str, option: str) -> Optional[str]:
+    """Read one option from the effective ansible.cfg (None if unset)."""
+    cfg_path = ansible_cfg_path(working_dir)
+    if cfg_path is None:
+        return None
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        parser.read(cfg_path, encoding="utf-8")
+        return parser.get(section, option, fallback=None)
+    except (configparser.Error, UnicodeDecodeError):
+        return None
+
+
+def _split_roles_path(value: str, base: Path) -> List[Path]:
+    return [base / Path(p).expanduser() for p in value.split(os.pathsep) if p]
+
+
+def roles_path(working_dir: Path) -> List[Path]:
+    """
+    Configured role directories: ANSIBLE_ROLES_PATH, else roles_path from
+    ansible.cfg (relative to the file), else ansible's default.
+    """
+    if os.environ.get("ANSIBLE_ROLES_PATH"):
+        return _split_roles_path(os.environ["ANSIBLE_ROLES_PATH"], working_dir)
+    value = ansible_cfg_option(working_dir, "defaults", "roles_path")
+    if value:
+        cfg_path = ansible_cfg_path(working_dir)
+        return _split_roles_path(value, cfg_path.parent if cfg_path else working_dir)
+    return _split_roles_path(DEFAULT_ROLES_PATH, working_dir)
+
+
+def role_search(working_dir: Path, playbook: Path) -> List[Path]:
+    """Directories searched for the roles of `playbook`, in ansible's order."""
+    search = [playbook.parent / "roles", working_dir / "roles"]
+    return list(dict.fromkeys([*search, *roles_path(working_dir)]))
+
+
+def find_role(name: str, search: Iterable[Path]) -> Optional[Path]:
+    """Find role `name` in `search`, a list of directories that contain roles."""
+    for base in search:
+        candidate = base / name
+        if candidate.is_dir():
+            return candidate
+    return None
+
+
+def role_names(entries: Any) -> Set[str]:
+    """Role names from a play's `roles:` list or a role's meta dependencies."""
+    names: Set[str] = set()
+    if not isinstance(entries, list):
+        return names
+    for entry in entries:
+        if isinstance(entry, str):
+            names.add(entry)
+        elif isinstance(entry, dict):
+            name = entry.get("role") or entry.get("name")
+            if isinstance(name, str):
+                names.add(name)
+    return names
+
+
+def roles_in_tasks(tasks: Any) -> Set[str]:
+    """Roles pulled in by include_role/import_role, including inside blocks."""
+    names: Set[str] = set()
+    if not isinstance(tasks, list):
+        return names
+    for task in tasks:
+        if not isinstance(task, dict):
+            continue
+        for action in ROLE_ACTIONS:
+            spec = task.get(action)
+            if isinstance(spec, dict) and isinstance(spec.get("name"), str):
+                names.add(spec["name"])
+        for nested in ("block", "rescue", "always"):
+            names |= roles_in_tasks(task.get(nested))
+    return names
+
+
+def _included_names(tasks: Any) -> List[str]:
+    """File names of include_tasks/import_tasks, including inside blocks."""
+    names: List[str] = []
+    if not isinstance(tasks, list):
+        return names
+    for task in tasks:
+        if not isinstance(task, dict):
+            continue
+        for action in TASK_INCLUDES:
+            spec = task.get(action)
+            if isinstance(spec, dict):
+                spec = spec.get("file")
+            if isinstance(spec, str) and "{{" not in spec:
+                names.append(spec)
+        for nested in ("block", "rescue", "always"):
+            names.extend(_included_names(task.get(nested)))
+    return names
+
+
+def task_files(
+    tasks: Any, search: List[Path], seen: Optional[Set[Path]] = None
+) -> List[Path]:
+    """
+    Task files loaded by include_tasks/import_tasks in `tasks`, recursively.
+    Names resolve against the including file's directory, then `search`.
+    Templated names cannot be resolved before runtime and are skipped.
+    """
+    seen = set() if seen is None else seen
+    paths: List[Path] = []
+    for name in _included_names(tasks):
+        path = next((d / name for d in search if (d / name).is_file()), None)
+        if path is None or path in seen:
+            continue
+        seen.add(path)
+        paths.append(path)
+        paths.extend(task_files(load_yaml(path), [path.parent, *search], seen))
+    return paths
+
+
+def play_task_files(play: dict, playbook: Path) -> List[Path]:
+    """Task files included by the play's own task sections."""
+    seen: Set[Path] = set()
+    paths: List[Path] = []
+    for section in TASK_SECTIONS:
+        paths.extend(task_files(play.get(section), [playbook.parent], seen))
+    return paths
+
+
+def role_tree(
+    name: str, search: List[Path], seen: Optional[Set[Path]] = None
+) -> List[Path]:
+    """
+    Directory of role `name` followed by those of its meta dependencies
+    (recursively). Roles already in `seen` are not returned again.
+    """
+    seen = set() if seen is None else seen
+    role = find_role(name, search)
+    if role is None or role in seen:
+        return []
+    seen.add(role)
+    paths = [role]
+    meta = load_yaml(role / "meta" / "main.yml")
+    if isinstance(meta, dict):
+        for dep in sorted(role_names(meta.get("dependencies"))):
+            paths.extend(role_tree(dep, search, seen))
+    return paths
+
+
+def iter_playbooks(
+    working_dir: Path, playbook: str
+) -> Iterator[Tuple[Path, List[dict]]]:
+    """
+    Yield (path, plays) for `playbook` and every playbook it imports, each
+    file once. Missing imports are skipped; an unparseable playbook is
+    yielded with no plays.
+    """
+    seen: Set[Path] = set()
+
+    def visit(path: Path) -> Iterator[Tuple[Path, List[dict]]]:
+        if path in seen or not path.is_file():
+            return
+        seen.add(path)
+        data = load_yaml(path)
+        plays = data if isinstance(data, list) else []
+        plays = [p for p in plays if isinstance(p, dict)]
+        yield path, plays
+        for play in plays:
+            for key in PLAYBOOK_IMPORTS:
+                if isinstance(play.get(key), str):
+                    yield from visit(path.parent / play[key])
+
+    yield from visit(working_dir / playbook)
+
+
+def play_roles(
+    play: dict, search: List[Path], playbook: Optional[Path] = None
+) -> List[Path]:
+    """
+    Role directories (with dependencies) applied by `play`, in any way.
+    With `playbook`, roles included from the play's task files count too.
+    """
+    seen: Set[Path] = set()
+    paths: List[Path] = []
+    names = role_names(play.get("roles"))
+    for section in TASK_SECTIONS:
+        names |= roles_in_tasks(play.get(section))
+    for path in play_task_files(play, playbook) if playbook is not None else []:
+        names |= roles_in_tasks(load_yaml(path))
+    for name in sorted(names):
+        paths.extend(role_tree(name, search, seen))
+    return paths
+
+
+def vars_files(play: dict, playbook: Path) -> List[Path]:
+    """The play's vars_files; templated paths cannot be resolved before runtime."""
+    return [
+        playbook.parent / f
+        for f in play.get("vars_files") or []
+        if isinstance(f, str) and "{{" not in f
+    ]
@@ -6,14 +6,35 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # NOTE: Assuming core imports are correctly aliased or fixed in your local setup
 # based on the package name `ansible_runner`
+from ansible_runner.config_loader import ResourcePolicy, TuningProfile
 from ansible_runner.utils import ensure_file_readable, safe_join
-from ansible_runner.exceptions import ProcessExecutionError
+from ansible_runner.exceptions import (
+    PreflightError,
+    ProcessExecutionError,
+    RunnerError,
+)
+from ansible_runner.facts import FactCache
+from ansible_runner.journal import ExecutionJournal
+from ansible_runner.limits import apply_policy
+from ansible_runner.logger import STREAM_EXTRA
+from ansible_runner.preflight import (
+    PreflightCache,
+    PreflightResult,
+    content_hash,
+    parse_list_hosts,
+    result_from_cache,
+    result_to_cache,
+)
+from ansible_runner.spawn import resolve_command, spawn_kwargs
+from ansible_runner.ssh_pool import SSHControlPool
 
 logger = logging.getLogger(__name__)
 
@@ -26,10 +47,65 @@ class AnsibleRunner:
     """
 
     # Accept ansible_binary in __init__
-    def __init__(self, working_dir: Path, ansible_binary: str = "ansible-playbook"):
+    def __init__(
+        self,
+        working_dir: Path,
+        ansible_binary: str = "ansible-playbook",
+        journal: Optional[ExecutionJournal] = None,
+        ssh_pool: Optional[SSHControlPool] = None,
+        tuning_profiles: Optional[Dict[str, TuningProfile]] = None,
+        spawn_mode: str = "default",
+        priority_classes: Optional[Dict[str, ResourcePolicy]] = None,
+        default_priority_class: Optional[str] = None,
+        fact_cache: Optional[FactCache] = None,
+    ):
         self.working_dir = working_dir
         self.ansible_binary = ansible_binary  # Stored from config
+        self.journal = journal  # Records starts/completions of named jobs
+        self.ssh_pool = ssh_pool  # Shared ControlMaster sockets across runs
+        self.tuning_profiles = tuning_profiles or {}  # Keyed by inventory
+        self.spawn_mode = spawn_mode  # "default" or posix_spawn-friendly "fast"
+        self.priority_classes = priority_classes or {}
+        self.default_priority_class = default_priority_class
+        self.fact_cache = fact_cache  # Persistent facts shared across runs
+
+    def _policy_for(
+        self, priority_class: Optional[str]
+    ) -> Optional[ResourcePolicy]:
+        """
+        Resolve a priority class name (or the default) to its resource policy.
+        Raises RunnerError for unknown class names.
+        """
+        name = priority_class or self.default_priority_class
+        if name is None:
+            return None
+        if name not in self.priority_classes:
+            raise RunnerError(f"Unknown priority class: {name}")
+        return self.priority_classes[name]
 
+    def _profile_for(self, inventory: Optional[str]) -> Optional[TuningProfile]:
+        return self.tuning_profiles.get(inventory) if inventory else None
+
+    def _build_env(
+        self,
+        inventory: Optional[str] = None,
+        profile: Optional[TuningProfile] = None,
+    ) -> dict[str, str]:
+        """
+        Build the environment for ansible-playbook: the current environment
+        plus settings injected by the runner (SSH connection pool, fact
+        cache, tuning profile for the inventory).
+        """
+        env = dict(os.environ)
+        if self.ssh_pool is not None:
+            env.update(self.ssh_pool.env(self.working_dir))
+        if self.fact_cache is not None:
+            env.update(self.fact_cache.env())
+        profile = profile or self._profile_for(inventory)
+        if profile is not None:
+            env["ANSIBLE_STRATEGY"] = profile.strategy
+            env["ANSIBLE_PIPELINING"] = str(profile.pipelining)
+        return env
 
     def _build_command(
         self,
@@ -37,6 +113,9 @@ class AnsibleRunner:
         inventory: Optional[str] = None,
         extra_vars: Optional[dict] = None,
         dry_run: bool = False,
+        profile: Optional[TuningProfile] = None,
+        tags: Optional[List[str]] = None,
+        limit: Optional[str] = None,
     ) -> list[str]:
         """
         Build ansible-playbook command safely.
@@ -58,44 +137,175 @@ class AnsibleRunner:
         if dry_run:
             cmd.append("--check")
 
+        # Incremental runs narrow the run to changed roles/hosts
+        if tags:
+            cmd.extend(["--tags", ",".join(tags)])
+        if limit:
+            cmd.extend(["--limit", limit])
+
+        # Apply the explicit or auto-tuned profile for this inventory
+        profile = profile or self._profile_for(inventory)
+        if profile is not None:
+            cmd.extend(["--forks", str(profile.forks)])
+
         return cmd
 
-    def run_playbook( 
+    def _run_check(
+        self,
+        playbook: str,
+        inventory: Optional[str],
+        flag: str,
+        limit: Optional[str] = None,
+    ) -> Tuple[int, str, str]:
+        """Run one preflight check quietly and return (rc, stdout, stderr)."""
+        try:
+            cmd = self._build_command(playbook, inventory, limit=limit) + [flag]
+        except (OSError, RunnerError) as e:
+            return -1, "", str(e)
+        proc = subprocess.run(
+            cmd,
+            cwd=self.working_dir,
+            env=self._build_env(inventory),
+            capture_output=True,
+            text=True,
+        )
+        return proc.returncode, proc.stdout, proc.stderr
+
+    def list_hosts(
+        self,
+        playbook: str,
+        inventory: Optional[str] = None,
+        limit: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Hosts the playbook's plays target (after `limit`), from --list-hosts.
+        Returns an empty list, with a warning, if the listing fails.
+        """
+        rc, out, err = self._run_check(playbook, inventory, "--list-hosts", limit)
+        if rc != 0:
+            logger.warning("Could not list hosts for %s: %s", playbook, err.strip())
+            return []
+        return parse_list_hosts(out)
+
+    def preflight(
+        self,
+        targets: Iterable[Tuple[str, Optional[str]]],
+        cache: Optional[PreflightCache] = None,
+        workers: int = 4,
+    ) -> List[PreflightResult]:
+        """
+        Run --syntax-check and --list-hosts for each (playbook, inventory)
+        target, in parallel across playbooks. Targets whose content hash is
+        cached are not checked again.
+        Raises PreflightError listing every target that failed.
+        """
+        targets = list(dict.fromkeys(targets))
+        results: dict = {}
+        keys: dict = {}
+        for playbook, inventory in targets:
+            key = content_hash(
+                Path(self.working_dir), playbook, inventory, salt=self.ansible_binary
+            )
+            cached = cache.get(key) if cache is not None else None
+            if cached is not None:
+                logger.info("Preflight cache hit: %s", playbook)
+                results[(playbook, inventory)] = result_from_cache(cached)
+            else:
+                keys[(playbook, inventory)] = key
+
+        flags = ("--syntax-check", "--list-hosts")
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {
+                (target, flag): pool.submit(self._run_check, target[0], target[1], flag)
+                for target in keys
+                for flag in flags
+            }
+            for target, key in keys.items():
+                syntax_rc, _, syntax_err = futures[(target, flags[0])].result()
+                hosts_rc, hosts_out, hosts_err = futures[(target, flags[1])].result()
+                result = PreflightResult(
+                    playbook=target[0],
+                    inventory=target[1],
+                    syntax_ok=syntax_rc == 0,
+                    hosts=parse_list_hosts(hosts_out) if hosts_rc == 0 else [],
+                    error=(syntax_err if syntax_rc != 0 else "")
+                    + (hosts_err if hosts_rc != 0 else ""),
+                )
+                results[target] = result
+                # Only successful checks are cached; failures are re-checked
+                if cache is not None and syntax_rc == 0 and hosts_rc == 0:
+                    cache.put(key, result_to_cache(result))
+
+        ordered = [results[target] for target in targets]
+        failed = [r for r in ordered if not r.syntax_ok or r.error]
+        for r in ordered:
+            logger.info(
+                "Preflight %s: %s, %d host(s)%s",
+                r.playbook,
+                "FAILED" if r in failed else "ok",
+                len(r.hosts),
+                " (cached)" if r.cached else "",
+            )
+        if failed:
+            details = "; ".join(f"{r.playbook}: {r.error.strip()}" for r in failed)
+            raise PreflightError(
+                f"Preflight failed for {len(failed)} playbook(s): {details}"
+            )
+        return ordered
+
+    def _journal_start(self, job_id: Optional[str], pid: Optional[int]) -> None:
+        if self.journal is not None and job_id:
+            self.journal.start(job_id, pid)
+
+    def _journal_complete(self, job_id: Optional[str], rc: int) -> None:
+        if self.journal is not None and job_id:
+            self.journal.complete(job_id, rc)
+
+    def run_playbook(
         self,
         playbook: str,
         inventory: Optional[str] = None,
         extra_vars: Optional[dict] = None,
         dry_run: bool = False,
+        job_id: Optional[str] = None,
+        priority_class: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        limit: Optional[str] = None,
     ) -> int:
         """
         Run playbook synchronously with real-time output.
         Raises ProcessExecutionError if return code != 0.
         """
-        cmd = self._build_command(playbook, inventory, extra_vars, dry_run)
+        cmd = self._build_command(
+            playbook, inventory, extra_vars, dry_run, tags=tags, limit=limit
+        )
+        policy = self._policy_for(priority_class)
         cmd_str = " ".join(cmd)
         logger.info("Executing: %s", cmd_str)
 
         # Use subprocess.Popen for live streaming output (professional standard)
         process = subprocess.Popen(
-            cmd,
-            cwd=self.working_dir,
+            resolve_command(self.spawn_mode, cmd),
+            **spawn_kwargs(self.spawn_mode, self.working_dir),
+            env=self._build_env(inventory),
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
         )
+        self._journal_start(job_id, process.pid)
+        apply_policy(process.pid, policy)
 
         # Stream live output
         if process.stdout:
             for line in process.stdout:  
-                logger.info(line.strip())
+                logger.info(line.strip(), extra=STREAM_EXTRA)
         if process.stderr:
             for line in process.stderr:  
-                logger.error(line.strip())
+                logger.error(line.strip(), extra=STREAM_EXTRA)
 
         process.wait()
+        self._journal_complete(job_id, process.returncode)
 
-        # Remove trailing whitespace line (flake8 W293)
-        
         if process.returncode != 0:
             # Includes stdout/stderr in the exception for better debugging/testing
             raise ProcessExecutionError(
@@ -111,32 +321,45 @@ class AnsibleRunner:
         inventory: Optional[str] = None,
         extra_vars: Optional[dict] = None,
         dry_run: bool = False,
+        job_id: Optional[str] = None,
+        priority_class: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        limit: Optional[str] = None,
     ) -> int:
         """
         Run playbook asynchronously using asyncio.
         """
-        cmd = self._build_command(playbook, inventory, extra_vars, dry_run)
+        cmd = self._build_command(
+            playbook, inventory, extra_vars, dry_run, tags=tags, limit=limit
+        )
+        policy = self._policy_for(priority_class)
         cmd_str = " ".join(cmd)
         logger.info("Executing async: %s", cmd_str)
 
         # Use asyncio for non-blocking execution
         process = await asyncio.create_subprocess_exec(
-            *cmd,
-            cwd=self.working_dir,
+            *resolve_command(self.spawn_mode, cmd),
+            **spawn_kwargs(self.spawn_mode, self.working_dir),
+            env=self._build_env(inventory),
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
+        self._journal_start(job_id, process.pid)
+        if policy is not None:
+            # ionice is a blocking subprocess; keep it off the event loop
+            await asyncio.to_thread(apply_policy, process.pid, policy)
 
         # Stream async output
         # NOTE: Decoding is necessary here as asyncio process streams raw bytes
         if process.stdout:
             async for line in process.stdout:
-                logger.info(line.decode().strip())
+                logger.info(line.decode().strip(), extra=STREAM_EXTRA)
         if process.stderr:
             async for line in process.stderr:
-                logger.error(line.decode().strip())
+                logger.error(line.decode().strip(), extra=STREAM_EXTRA)
                 
         rc = await process.wait()
+        self._journal_complete(job_id, rc)
         if rc != 0:
             # Don't have direct access to full captured stdout/stderr here
             raise ProcessExecutionError(rc)
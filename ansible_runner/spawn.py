@@ -0,0 +1,81 @@
+"""
+Purpose: Process-spawn settings and event loop selection for high fan-out runs.
+
+Spawn modes:
+- "default": close_fds=True with cwd=working_dir. CPython then takes the
+  fork/exec path, which scans and closes inherited fds in the child.
+- "fast": settings that let CPython use posix_spawn (a vfork-style spawn
+  that avoids copying a large parent's page tables). These are
+  close_fds=False, an absolute executable path, and cwd=None when the
+  working directory is already the current directory. Python creates fds
+  non-inheritable by default (PEP 446), so close_fds=False leaks nothing.
+  If the working directory differs, posix_spawn cannot change directory,
+  so the fork/exec path is used. close_fds=False still skips the fd scan.
+
+The event loop can optionally be uvloop. libuv reaps children with its own
+SIGCHLD handling instead of asyncio's child watchers. uvloop is an optional
+dependency: when it is not installed, the standard asyncio loop is used and
+a warning is logged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Coroutine, Dict, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+SPAWN_MODES = ("default", "fast")
+
+T = TypeVar("T")
+
+
+def spawn_kwargs(mode: str, working_dir: Optional[Path]) -> Dict[str, Any]:
+    """
+    Return Popen / create_subprocess_exec keyword arguments for `mode`.
+    """
+    if mode == "fast":
+        cwd: Optional[Path] = working_dir
+        if working_dir is None or Path(working_dir).resolve() == Path.cwd().resolve():
+            cwd = None
+        return {"cwd": cwd, "close_fds": False}
+    return {"cwd": working_dir, "close_fds": True}
+
+
+def resolve_command(mode: str, cmd: List[str]) -> List[str]:
+    """
+    In fast mode, make the executable an absolute path (posix_spawn is only
+    used when the executable has a directory component).
+    """
+    if mode != "fast" or os.path.dirname(cmd[0]):
+        return cmd
+    resolved = shutil.which(cmd[0])
+    return [resolved, *cmd[1:]] if resolved else cmd
+
+
+def uvloop_available() -> bool:
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def run_async(coro: Coroutine[Any, Any, T], use_uvloop: bool = False) -> T:
+    """
+    Run `coro` to completion like asyncio.run, on uvloop when requested and
+    installed.
+    """
+    if use_uvloop:
+        try:
+            import uvloop
+        except ImportError:
+            logger.warning("uvloop requested but not installed; using asyncio loop")
+        else:
+            with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+                return runner.run(coro)
+    return asyncio.run(coro)
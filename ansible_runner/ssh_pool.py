@@ -0,0 +1,223 @@
+"""
+Purpose: Shared SSH ControlMaster connection pool across ansible-playbook runs.
+
+Every run started by AnsibleRunner gets the same ControlPath directory and
+ControlPersist lifetime (through ANSIBLE_SSH_* environment variables), so
+consecutive and concurrent runs reuse each other's master connections
+instead of handshaking with every host again. The Control* options are
+appended to the user's effective ssh_args (ANSIBLE_SSH_ARGS, else
+[ssh_connection] ssh_args in ansible.cfg, else ansible's default), so
+options such as ProxyJump or ForwardAgent are kept. The pool can be pre-warmed
+for an inventory, and sockets whose master has exited are garbage-collected.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import shlex
+import socket
+import stat
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ansible_runner.project import ansible_cfg_option
+
+logger = logging.getLogger(__name__)
+
+# sun_path is limited to 108 bytes on Linux (104 on macOS); %C expands to 40 hex chars
+_MAX_SOCKET_PATH = 104
+_CONTROL_HASH_LEN = 40
+
+# ansible's ssh_args when neither ANSIBLE_SSH_ARGS nor ansible.cfg set them
+DEFAULT_SSH_ARGS = "-C -o ControlMaster=auto -o ControlPersist=60s"
+# Options the pool owns; ssh uses the first value given, so user copies go
+_POOL_OPTIONS = {"controlmaster", "controlpersist", "controlpath"}
+
+
+def _option_name(option: str) -> str:
+    return re.split(r"[=\s]", option.strip(), maxsplit=1)[0].lower()
+
+
+def strip_ssh_options(args: str, names=_POOL_OPTIONS) -> List[str]:
+    """Split ssh args and drop every `-o <name>=...` whose name is in `names`."""
+    tokens = shlex.split(args)
+    kept: List[str] = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token == "-o" and i + 1 < len(tokens):
+            if _option_name(tokens[i + 1]) not in names:
+                kept.extend(tokens[i : i + 2])
+            i += 2
+            continue
+        if not (token.startswith("-o") and _option_name(token[2:]) in names):
+            kept.append(token)
+        i += 1
+    return kept
+
+
+def user_ssh_args(working_dir: Optional[Path] = None) -> str:
+    """The ssh_args ansible would use without the pool."""
+    if "ANSIBLE_SSH_ARGS" in os.environ:
+        return os.environ["ANSIBLE_SSH_ARGS"]
+    configured = ansible_cfg_option(
+        Path(working_dir or "."), "ssh_connection", "ssh_args"
+    )
+    return DEFAULT_SSH_ARGS if configured is None else configured
+
+
+class SSHControlPool:
+    """
+    Manage a ControlPath directory shared by all ansible-playbook processes.
+    """
+
+    def __init__(
+        self,
+        control_dir: str | Path,
+        persist_seconds: int = 600,
+        ssh_binary: str = "ssh",
+        connect_timeout: int = 10,
+    ):
+        self.control_dir = Path(control_dir).expanduser()
+        self.persist_seconds = persist_seconds
+        self.ssh_binary = ssh_binary
+        self.connect_timeout = connect_timeout
+        if len(str(self.control_dir)) + 1 + _CONTROL_HASH_LEN > _MAX_SOCKET_PATH:
+            logger.warning(
+                "SSH control_dir %s is too long for unix sockets; "
+                "ssh will fail to create masters",
+                self.control_dir,
+            )
+
+    @property
+    def control_path(self) -> str:
+        # %C (hash of local host, remote host, port and user) is identical for
+        # ansible's connections and our pre-warm, so both share one socket
+        return str(self.control_dir / "%C")
+
+    def ensure_dir(self) -> None:
+        self.control_dir.mkdir(parents=True, exist_ok=True)
+        os.chmod(self.control_dir, 0o700)
+
+    def env(self, working_dir: Optional[Path] = None) -> Dict[str, str]:
+        """
+        Environment overrides that point ansible's ssh connections at the pool,
+        keeping the user's other ssh_args.
+        """
+        self.ensure_dir()
+        args = strip_ssh_options(user_ssh_args(working_dir))
+        args += [
+            "-o",
+            "ControlMaster=auto",
+            "-o",
+            f"ControlPersist={self.persist_seconds}s",
+        ]
+        return {
+            "ANSIBLE_SSH_ARGS": shlex.join(args),
+            "ANSIBLE_SSH_CONTROL_PATH_DIR": str(self.control_dir),
+            "ANSIBLE_SSH_CONTROL_PATH": "%(directory)s/%%C",
+        }
+
+    def _warm_command(self, host: str, host_vars: Dict[str, str]) -> List[str]:
+        cmd = [
+            self.ssh_binary,
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPersist={self.persist_seconds}s",
+            "-o", f"ControlPath={self.control_path}",
+            "-o", "BatchMode=yes",
+            "-o", f"ConnectTimeout={self.connect_timeout}",
+        ]  # fmt: skip
+        port = host_vars.get("ansible_port") or host_vars.get("ansible_ssh_port")
+        user = host_vars.get("ansible_user") or host_vars.get("ansible_ssh_user")
+        if port:
+            cmd.extend(["-o", f"Port={port}"])
+        if user:
+            cmd.extend(["-o", f"User={user}"])
+        address = (
+            host_vars.get("ansible_host") or host_vars.get("ansible_ssh_host") or host
+        )
+        cmd.extend([address, "true"])
+        return cmd
+
+    def _warm_one(self, host: str, host_vars: Dict[str, str]) -> bool:
+        cmd = self._warm_command(host, host_vars)
+        try:
+            proc = subprocess.run(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True,
+                timeout=self.connect_timeout + 5,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning("SSH pre-warm failed for %s: %s", host, e)
+            return False
+        if proc.returncode != 0:
+            logger.warning("SSH pre-warm failed for %s: %s", host, proc.stderr.strip())
+            return False
+        return True
+
+    def prewarm(
+        self, hosts: Dict[str, Dict[str, str]], workers: int = 16
+    ) -> Dict[str, bool]:
+        """
+        Open a persistent master connection to every host in parallel.
+        Returns {host: success}.
+        """
+        self.ensure_dir()
+        self.gc()
+        if not hosts:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {
+                host: pool.submit(self._warm_one, host, host_vars)
+                for host, host_vars in hosts.items()
+            }
+            results = {host: f.result() for host, f in futures.items()}
+        logger.info(
+            "SSH pool pre-warmed %d/%d host(s)",
+            sum(results.values()),
+            len(results),
+        )
+        return results
+
+    def gc(self) -> int:
+        """
+        Remove control sockets whose master process is gone.
+        Returns the number of sockets removed.
+        """
+        if not self.control_dir.is_dir():
+            return 0
+        removed = 0
+        for entry in self.control_dir.iterdir():
+            try:
+                if not stat.S_ISSOCK(entry.lstat().st_mode):
+                    continue
+            except FileNotFoundError:
+                continue
+            if _socket_alive(entry):
+                continue
+            entry.unlink(missing_ok=True)
+            removed += 1
+        if removed:
+            logger.info("Removed %d stale SSH control socket(s)", removed)
+        return removed
+
+
+def _socket_alive(path: Path) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(1.0)
+    try:
+        sock.connect(str(path))
+    except (ConnectionRefusedError, FileNotFoundError):
+        return False
+    except OSError:
+        # Permission problems or timeouts: leave the socket alone
+        return True
+    finally:
+        sock.close()
+    return True
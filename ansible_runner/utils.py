@@ -7,8 +7,11 @@ Recruiter notes:
 """
 
 from pathlib import Path
+import re
+import shlex
 import shutil
 import os
+import yaml
 from .exceptions import RunnerError
 
 
@@ -43,3 +46,135 @@ def which(binary_name: str) -> str | None:
     """
     result = shutil.which(binary_name)
     return result
+
+
+def _expand_host_range(pattern: str) -> list[str]:
+    """Expand a numeric inventory range such as web[01:03] into host names."""
+    match = re.search(r"\[(\d+):(\d+)\]", pattern)
+    if not match:
+        return [pattern]
+    start, end = match.group(1), match.group(2)
+    width = len(start) if start.startswith("0") else 0
+    return [
+        pattern[: match.start()] + str(i).zfill(width) + pattern[match.end() :]
+        for i in range(int(start), int(end) + 1)
+    ]
+
+
+def _parse_yaml_inventory(data, hosts: dict[str, dict[str, str]]) -> None:
+    if not isinstance(data, dict):
+        return
+    for group in data.values():
+        if not isinstance(group, dict):
+            continue
+        for name, host_vars in (group.get("hosts") or {}).items():
+            for host in _expand_host_range(str(name)):
+                entry = hosts.setdefault(host, {})
+                if isinstance(host_vars, dict):
+                    entry.update({k: str(v) for k, v in host_vars.items()})
+        _parse_yaml_inventory(group.get("children"), hosts)
+
+
+def parse_inventory_hosts(path: str) -> dict[str, dict[str, str]]:
+    """
+    Return {host: inline host vars} for a static INI or YAML inventory
+    (or a directory of them). Dynamic inventory scripts are not executed.
+    """
+    p = Path(path)
+    hosts: dict[str, dict[str, str]] = {}
+    files = sorted(f for f in p.iterdir() if f.is_file()) if p.is_dir() else [p]
+    for f in files:
+        if f.name.startswith(".") or os.access(f, os.X_OK):
+            continue
+        text = ensure_file_readable(str(f)).read_text(encoding="utf-8")
+        if f.suffix in (".yml", ".yaml"):
+            _parse_yaml_inventory(yaml.safe_load(text), hosts)
+            continue
+        section_is_hosts = True
+        for line in text.splitlines():
+            line = line.split("#", 1)[0].split(";", 1)[0].strip()
+            if not line:
+                continue
+            if line.startswith("[") and line.endswith("]"):
+                # [group:vars] and [group:children] do not list hosts
+                section_is_hosts = ":" not in line
+                continue
+            if not section_is_hosts:
+                continue
+            name, *pairs = shlex.split(line)
+            host_vars = dict(kv.split("=", 1) for kv in pairs if "=" in kv)
+            for host in _expand_host_range(name):
+                hosts.setdefault(host, {}).update(host_vars)
+    return hosts
+
+
+def _parse_yaml_groups(data, members: dict, children: dict) -> None:
+    if not isinstance(data, dict):
+        return
+    for name, group in data.items():
+        members.setdefault(str(name), set())
+        if not isinstance(group, dict):
+            continue
+        for host in group.get("hosts") or {}:
+            members[str(name)].update(_expand_host_range(str(host)))
+        kids = group.get("children")
+        if isinstance(kids, dict):
+            children.setdefault(str(name), set()).update(str(k) for k in kids)
+            _parse_yaml_groups(kids, members, children)
+
+
+def parse_inventory_groups(path: str) -> dict[str, set[str]]:
+    """
+    Return {host: every group it belongs to} for a static INI or YAML
+    inventory (or a directory of them). Groups are resolved through
+    [group:children] / children: so a host is also in its parents' groups;
+    "all" is always included and "ungrouped" for hosts without a group.
+    Dynamic inventory scripts are not executed.
+    """
+    p = Path(path)
+    members: dict[str, set[str]] = {}
+    children: dict[str, set[str]] = {}
+    files = sorted(f for f in p.iterdir() if f.is_file()) if p.is_dir() else [p]
+    for f in files:
+        if f.name.startswith(".") or os.access(f, os.X_OK):
+            continue
+        text = ensure_file_readable(str(f)).read_text(encoding="utf-8")
+        if f.suffix in (".yml", ".yaml"):
+            _parse_yaml_groups(yaml.safe_load(text), members, children)
+            continue
+        group, kind = "ungrouped", "hosts"
+        for line in text.splitlines():
+            line = line.split("#", 1)[0].split(";", 1)[0].strip()
+            if not line:
+                continue
+            if line.startswith("[") and line.endswith("]"):
+                group, _, kind = line[1:-1].partition(":")
+                kind = kind or "hosts"
+                members.setdefault(group, set())
+                continue
+            name = shlex.split(line)[0]
+            if kind == "hosts":
+                members.setdefault(group, set()).update(_expand_host_range(name))
+            elif kind == "children":
+                children.setdefault(group, set()).add(name)
+
+    parents: dict[str, set[str]] = {}
+    for parent, kids in children.items():
+        for kid in kids:
+            parents.setdefault(kid, set()).add(parent)
+    groups: dict[str, set[str]] = {}
+    for group, hosts in members.items():
+        # The group and all of its ancestors
+        lineage, stack = set(), [group]
+        while stack:
+            name = stack.pop()
+            if name not in lineage:
+                lineage.add(name)
+                stack.extend(parents.get(name, ()))
+        for host in hosts:
+            groups.setdefault(host, set()).update(lineage)
+    for host_groups in groups.values():
+        if not host_groups - {"all", "ungrouped"}:
+            host_groups.add("ungrouped")
+        host_groups.add("all")
+    return groups
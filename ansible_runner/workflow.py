@@ -0,0 +1,326 @@
+"""
+Purpose: Run a DAG of dependent playbook jobs with maximal parallelism.
+
+A workflow file describes jobs and the jobs they depend on (``needs``).
+Every job whose dependencies have succeeded is started immediately through
+``AnsibleRunner.run_playbook_async``, bounded by a concurrency budget.
+Dependents of a failed job are skipped instead of being run.
+
+Example workflow file::
+
+    max_concurrency: 4
+    jobs:
+      base:
+        playbook: playbooks/base.yml
+      db:
+        playbook: playbooks/db.yml
+        needs: [base]
+      cache:
+        playbook: playbooks/cache.yml
+        needs: [base]
+      app:
+        playbook: playbooks/app.yml
+        needs: [db, cache]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+from ansible_runner.exceptions import (
+    ProcessExecutionError,
+    RunnerError,
+    WorkflowError,
+)
+from ansible_runner.journal import ExecutionJournal
+
+logger = logging.getLogger(__name__)
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+class WorkflowJob(BaseModel):
+    playbook: str
+    inventory: Optional[str] = None
+    extra_vars: Dict[str, Any] = {}
+    needs: List[str] = []
+    priority_class: Optional[str] = None
+
+    @field_validator("needs")
+    @classmethod
+    def _unique_needs(cls, value: List[str]) -> List[str]:
+        # Dependencies are counted per entry: "needs: [a, a]" means "needs: [a]"
+        return list(dict.fromkeys(value))
+
+
+class WorkflowSpec(BaseModel):
+    max_concurrency: int = Field(4, ge=1)
+    jobs: Dict[str, WorkflowJob]
+
+
+@dataclass
+class JobResult:
+    name: str
+    status: str
+    returncode: Optional[int] = None
+    started: float = 0.0
+    finished: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        return max(0.0, self.finished - self.started)
+
+
+@dataclass
+class WorkflowReport:
+    results: Dict[str, JobResult] = field(default_factory=dict)
+    makespan: float = 0.0
+    critical_path: List[str] = field(default_factory=list)
+    critical_path_seconds: float = 0.0
+    serial_seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> bool:
+        return all(r.status == SUCCEEDED for r in self.results.values())
+
+
+def load_workflow(path: str) -> WorkflowSpec:
+    """
+    Load a workflow YAML file and validate it, including its dependency graph.
+    Raises WorkflowError on problems.
+    """
+    p = Path(path)
+    try:
+        content = p.read_text(encoding="utf-8")
+    except FileNotFoundError as e:
+        raise WorkflowError(f"Workflow file not found: {path}") from e
+    try:
+        raw = yaml.safe_load(content) or {}
+        spec = WorkflowSpec.model_validate(raw)
+    except (yaml.YAMLError, ValidationError) as e:
+        raise WorkflowError(f"Invalid workflow: {e}") from e
+    topological_order(spec)
+    return spec
+
+
+def topological_order(spec: WorkflowSpec) -> List[str]:
+    """
+    Return job names in a dependency-respecting order (Kahn's algorithm).
+    Raises WorkflowError on unknown dependencies or cycles.
+    """
+    for name, job in spec.jobs.items():
+        for dep in job.needs:
+            if dep not in spec.jobs:
+                raise WorkflowError(f"Job '{name}' needs unknown job '{dep}'")
+
+    indegree = {name: len(job.needs) for name, job in spec.jobs.items()}
+    ready = [name for name, count in indegree.items() if count == 0]
+    order: List[str] = []
+    while ready:
+        name = ready.pop(0)
+        order.append(name)
+        for other, job in spec.jobs.items():
+            if name in job.needs:
+                indegree[other] -= 1
+                if indegree[other] == 0:
+                    ready.append(other)
+
+    if len(order) != len(spec.jobs):
+        cyclic = sorted(set(spec.jobs) - set(order))
+        raise WorkflowError(f"Dependency cycle between jobs: {', '.join(cyclic)}")
+    return order
+
+
+class WorkflowEngine:
+    """
+    Schedule workflow jobs topologically, running every ready job concurrently.
+
+    With a journal, jobs recorded as successfully completed by a previous
+    run are not executed again.
+    """
+
+    def __init__(
+        self,
+        runner,
+        spec: WorkflowSpec,
+        inventory: Optional[str] = None,
+        extra_vars: Optional[dict] = None,
+        dry_run: bool = False,
+        max_concurrency: Optional[int] = None,
+        journal: Optional[ExecutionJournal] = None,
+    ):
+        self.runner = runner
+        self.spec = spec
+        self.inventory = inventory
+        self.extra_vars = extra_vars or {}
+        self.dry_run = dry_run
+        self.max_concurrency = max_concurrency or spec.max_concurrency
+        self.journal = journal
+
+    async def run(self) -> WorkflowReport:
+        """
+        Execute the workflow and return a report with per-job results,
+        the makespan and the critical path.
+        """
+        order = topological_order(self.spec)
+        remaining = {name: len(job.needs) for name, job in self.spec.jobs.items()}
+        dependents: Dict[str, List[str]] = {name: [] for name in order}
+        for name in order:
+            for dep in self.spec.jobs[name].needs:
+                dependents[dep].append(name)
+
+        budget = asyncio.Semaphore(self.max_concurrency)
+        results: Dict[str, JobResult] = {}
+        pending: Dict[asyncio.Task, str] = {}
+        t0 = time.monotonic()
+
+        def launch(name: str) -> None:
+            task = asyncio.create_task(self._run_job(name, budget, t0))
+            pending[task] = name
+
+        if self.journal is not None:
+            for name in order:
+                if self.journal.state.is_done(name):
+                    results[name] = JobResult(name=name, status=SUCCEEDED, returncode=0)
+                    logger.info("Workflow job '%s' already completed (journal)", name)
+                    for child in dependents[name]:
+                        remaining[child] -= 1
+
+        for name in order:
+            if remaining[name] == 0 and name not in results:
+                launch(name)
+
+        while pending:
+            done, _ = await asyncio.wait(
+                pending.keys(), return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                name = pending.pop(task)
+                result = task.result()
+                results[name] = result
+                for child in dependents[name]:
+                    if child in results:
+                        continue
+                    if result.status != SUCCEEDED:
+                        self._skip(child, name, dependents, results)
+                        continue
+                    remaining[child] -= 1
+                    if remaining[child] == 0:
+                        launch(child)
+
+        report = WorkflowReport(
+            results={name: results[name] for name in order},
+            makespan=time.monotonic() - t0,
+        )
+        report.serial_seconds = sum(r.duration for r in results.values())
+        report.critical_path, report.critical_path_seconds = self._critical_path(
+            order, results
+        )
+        return report
+
+    async def _run_job(
+        self, name: str, budget: asyncio.Semaphore, t0: float
+    ) -> JobResult:
+        job = self.spec.jobs[name]
+        extra_vars = {**self.extra_vars, **job.extra_vars}
+        if self.journal is not None:
+            self.journal.submit(name)
+        async with budget:
+            result = JobResult(name=name, status=SUCCEEDED)
+            result.started = time.monotonic() - t0
+            logger.info("Workflow job '%s' started", name)
+            try:
+                result.returncode = await self.runner.run_playbook_async(
+                    job.playbook,
+                    job.inventory or self.inventory,
+                    extra_vars,
+                    self.dry_run,
+                    job_id=name,
+                    priority_class=job.priority_class,
+                )
+            except ProcessExecutionError as e:
+                result.status = FAILED
+                result.returncode = e.returncode
+            except (RunnerError, OSError) as e:
+                result.status = FAILED
+                logger.error("Workflow job '%s' could not run: %s", name, e)
+            result.finished = time.monotonic() - t0
+
+        logger.info(
+            "Workflow job '%s' %s in %.1fs", name, result.status, result.duration
+        )
+        return result
+
+    def _skip(
+        self,
+        name: str,
+        cause: str,
+        dependents: Dict[str, List[str]],
+        results: Dict[str, JobResult],
+    ) -> None:
+        # Mark the job and everything downstream of it as skipped
+        stack = [name]
+        while stack:
+            current = stack.pop()
+            if current in results:
+                continue
+            results[current] = JobResult(name=current, status=SKIPPED)
+            logger.warning(
+                "Workflow job '%s' skipped: upstream '%s' did not succeed",
+                current,
+                cause,
+            )
+            stack.extend(dependents[current])
+
+    def _critical_path(
+        self, order: List[str], results: Dict[str, JobResult]
+    ) -> tuple[List[str], float]:
+        # Longest chain of measured job durations through the dependency graph
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for name in order:
+            best_dep = None
+            best = 0.0
+            for dep in self.spec.jobs[name].needs:
+                if finish[dep] > best or best_dep is None:
+                    best_dep, best = dep, finish[dep]
+            finish[name] = best + results[name].duration
+            previous[name] = best_dep
+
+        if not finish:
+            return [], 0.0
+        tail: str = max(order, key=lambda n: finish[n])
+        total = finish[tail]
+        path: List[str] = [tail]
+        node = previous[tail]
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        return list(reversed(path)), total
+
+
+def format_report(report: WorkflowReport) -> List[str]:
+    """Return human-readable report lines for logging."""
+    lines = [
+        f"{r.name}: {r.status} (rc={r.returncode}, {r.duration:.1f}s)"
+        for r in report.results.values()
+    ]
+    lines.append(
+        f"Critical path: {' -> '.join(report.critical_path) or '-'} "
+        f"({report.critical_path_seconds:.1f}s)"
+    )
+    lines.append(
+        f"Makespan: {report.makespan:.1f}s (serial equivalent: "
+        f"{report.serial_seconds:.1f}s)"
+    )
+    return lines
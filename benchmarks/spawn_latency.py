@@ -0,0 +1,115 @@
+"""
+Purpose: Spawn-latency benchmark for the AnsibleRunner spawn layer.
+
+Launches 1, 50 and 500 concurrent short-lived children (`sleep`) under each
+spawn configuration and reports per-spawn latency (mean / p95 / max) plus
+the wall time to get all children started:
+
+- sync-default / sync-fast: subprocess.Popen with spawn_kwargs(mode)
+- async-default / async-fast: asyncio.create_subprocess_exec on asyncio's loop
+- uvloop-default / uvloop-fast: the same on uvloop (skipped if not installed)
+
+To make the fork cost visible, the parent allocates --ballast-mb of memory
+before spawning.
+
+Usage:
+    python benchmarks/spawn_latency.py [--counts 1 50 500] [--ballast-mb 512]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ansible_runner.spawn import (  # noqa: E402
+    SPAWN_MODES,
+    resolve_command,
+    run_async,
+    spawn_kwargs,
+    uvloop_available,
+)
+
+CHILD = ["sleep", "0.5"]
+
+
+def _summary(latencies: list[float], wall: float) -> str:
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f"mean={statistics.fmean(ordered) * 1e3:7.3f}ms "
+        f"p95={p95 * 1e3:7.3f}ms max={ordered[-1] * 1e3:7.3f}ms "
+        f"launch-wall={wall * 1e3:8.1f}ms"
+    )
+
+
+def bench_sync(mode: str, count: int) -> str:
+    cmd = resolve_command(mode, CHILD)
+    kwargs = spawn_kwargs(mode, Path.cwd())
+    latencies, procs = [], []
+    start = time.perf_counter()
+    for _ in range(count):
+        t = time.perf_counter()
+        procs.append(subprocess.Popen(cmd, stdout=subprocess.PIPE, **kwargs))
+        latencies.append(time.perf_counter() - t)
+    wall = time.perf_counter() - start
+    for p in procs:
+        p.wait()
+        if p.stdout is not None:
+            p.stdout.close()
+    return _summary(latencies, wall)
+
+
+async def _bench_async(mode: str, count: int) -> str:
+    cmd = resolve_command(mode, CHILD)
+    kwargs = spawn_kwargs(mode, Path.cwd())
+    latencies: list[float] = []
+
+    async def spawn_one():
+        t = time.perf_counter()
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, **kwargs
+        )
+        latencies.append(time.perf_counter() - t)
+        return proc
+
+    start = time.perf_counter()
+    procs = await asyncio.gather(*(spawn_one() for _ in range(count)))
+    wall = time.perf_counter() - start
+    await asyncio.gather(*(p.wait() for p in procs))
+    return _summary(latencies, wall)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 50, 500])
+    parser.add_argument("--ballast-mb", type=int, default=512)
+    args = parser.parse_args()
+
+    ballast = bytearray(args.ballast_mb * 1024 * 1024)  # noqa: F841 (kept alive)
+    loops = [("sync", None), ("async", False)]
+    if uvloop_available():
+        loops.append(("uvloop", True))
+    else:
+        print("uvloop not installed: skipping uvloop rows")
+
+    for count in args.counts:
+        print(f"\n== {count} concurrent children (ballast {args.ballast_mb} MiB) ==")
+        for loop_name, use_uvloop in loops:
+            for mode in SPAWN_MODES:
+                if use_uvloop is None:
+                    line = bench_sync(mode, count)
+                else:
+                    line = run_async(_bench_async(mode, count), use_uvloop)
+                print(f"{loop_name + '-' + mode:16s} {line}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
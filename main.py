@@ -4,20 +4,33 @@ Purpose: Single entrypoint — loads config, sets up logger, parses CLI, runs pl
 
 from __future__ import annotations
 
-import asyncio
 import logging
 import sys
+import time
 from pathlib import Path
 
 # Using the correct package name for standard imports
-from ansible_runner.config_loader import load_config, ConfigValidationError
+from ansible_runner.autotune import AutoTuner
+from ansible_runner.config_loader import (
+    load_config,
+    save_tuning_profile,
+    ConfigValidationError,
+)
 from ansible_runner.runner import AnsibleRunner
 from ansible_runner.logger import get_logger, INFO
 from ansible_runner.cli import parse_args
 from ansible_runner.exceptions import RunnerError, ProcessExecutionError
+from ansible_runner.facts import FactCache, warm_facts
+from ansible_runner.incremental import IncrementalState, fingerprint_roles, plan_run
+from ansible_runner.journal import open_journal
+from ansible_runner.preflight import PreflightCache
+from ansible_runner.spawn import run_async
+from ansible_runner.ssh_pool import SSHControlPool
+from ansible_runner.utils import parse_inventory_hosts, safe_join
+from ansible_runner.workflow import WorkflowEngine, format_report, load_workflow
 
 
-def setup_logging(logging_cfg):
+def setup_logging(logging_cfg, console_mode=None):
     """Initializes the primary application logger based on configuration."""
     level = logging_cfg.level.upper()
     level_map = {
@@ -34,12 +47,46 @@ def setup_logging(logging_cfg):
         logfile=logging_cfg.file,
         max_bytes=logging_cfg.max_bytes,
         backup_count=logging_cfg.backup_count,
+        console_mode=console_mode or logging_cfg.console_mode,
+        refresh_hz=logging_cfg.console_refresh_hz,
     )
 
     # Set root logger level as well
     logging.getLogger().setLevel(level_map.get(level, INFO))
 
 
+def inventory_hosts(working_dir: str, inventories) -> dict:
+    """Merged {host: vars} of every static inventory in `inventories`."""
+    hosts = {}
+    for inv in sorted(inventories):
+        hosts.update(parse_inventory_hosts(safe_join(working_dir, inv)))
+    return hosts
+
+
+def fact_cache_snapshot(runner, fact_cache, targets, listed, limit=None) -> tuple:
+    """
+    Record the cache state of the hosts the run targets, just before it starts.
+    `listed` holds hosts already listed by preflight (valid without a limit).
+    """
+    hosts = set()
+    for target in targets:
+        known = listed.get(target) if limit is None else None
+        hosts.update(known if known is not None else runner.list_hosts(*target, limit))
+    return fact_cache.snapshot(sorted(hosts)), time.time()
+
+
+def log_fact_cache_stats(logger, fact_cache, snapshot) -> None:
+    """Report how many hosts of the run were served from the fact cache."""
+    stats = fact_cache.stats(*snapshot)
+    if stats.total:
+        logger.info(
+            "Fact cache: %d/%d host(s) served from cache (%.0f%% hit rate)",
+            stats.hits,
+            stats.total,
+            stats.hit_rate * 100,
+        )
+
+
 def main() -> int:
     # Use a basic logger for CLI/Config errors before main logging is set up
     temp_logger = logging.getLogger("pre_config")
@@ -52,12 +99,55 @@ def main() -> int:
     try:
         # Load config and initialize logging
         cfg = load_config(args.config)
-        setup_logging(cfg.logging)
+        setup_logging(cfg.logging, "progress" if args.progress else None)
         logger = logging.getLogger("ansible_runner")
 
-        # Instantiate runner with working_dir AND configured binary 
+        preflight_cache = PreflightCache(
+            cfg.preflight.cache_dir, cfg.preflight.max_cache_bytes
+        )
+        if args.clear_preflight_cache:
+            removed = preflight_cache.clear()
+            logger.info("Cleared %d preflight cache entries", removed)
+            return 0
+
+        ssh_pool = None
+        if cfg.ssh.pool_enabled or args.warm_ssh or args.ssh_gc:
+            ssh_pool = SSHControlPool(
+                cfg.ssh.control_dir,
+                persist_seconds=cfg.ssh.control_persist_seconds,
+                ssh_binary=cfg.ssh.ssh_binary,
+                connect_timeout=cfg.ssh.connect_timeout,
+            )
+        if args.ssh_gc and ssh_pool is not None:
+            ssh_pool.gc()
+            return 0
+
+        if args.resume and not args.journal:
+            logger.error("--resume requires --journal")
+            return 1
+
+        fact_cfg = cfg.ansible.fact_cache
+        fact_cache = None
+        if fact_cfg.enabled or args.warm_facts:
+            fact_cache = FactCache(
+                fact_cfg.path,
+                backend=fact_cfg.backend,
+                ttl_seconds=fact_cfg.ttl_seconds,
+                gathering=fact_cfg.gathering,
+            )
+
+        # Instantiate runner with working_dir AND configured binary
         runner = AnsibleRunner(
-            working_dir=Path(cfg.ansible.working_dir), ansible_binary=cfg.ansible.binary
+            working_dir=Path(cfg.ansible.working_dir),
+            ansible_binary=cfg.ansible.binary,
+            ssh_pool=ssh_pool,
+            tuning_profiles=cfg.tuning.profiles,
+            spawn_mode=cfg.runner.spawn_mode,
+            priority_classes=cfg.runner.priority_classes,
+            default_priority_class=(
+                args.priority_class or cfg.runner.default_priority_class
+            ),
+            fact_cache=fact_cache,
         )
 
         # Implement configuration fallback logic
@@ -69,6 +159,39 @@ def main() -> int:
             args.inventory if args.inventory else cfg.ansible.default_inventory
         )
 
+        # Auto-tune: measure calibration passes and persist the winner per inventory
+        if args.autotune:
+            tuner = AutoTuner(
+                runner,
+                inventory_to_use,
+                forks=cfg.tuning.forks,
+                strategies=cfg.tuning.strategies,
+                pipelining=cfg.tuning.pipelining,
+                calibration_playbook=cfg.tuning.calibration_playbook,
+                trials=cfg.tuning.trials,
+            )
+            best, _ = tuner.run()
+            save_tuning_profile(cfg.tuning.profiles_file, inventory_to_use, best)
+            logger.info(
+                "Saved tuning profile for %s to %s",
+                inventory_to_use,
+                cfg.tuning.profiles_file,
+            )
+            return 0
+
+        # Warm facts: run setup over the inventory in parallel shards, then exit
+        if args.warm_facts:
+            results = run_async(
+                warm_facts(
+                    runner,
+                    inventory_to_use,
+                    list(inventory_hosts(cfg.ansible.working_dir, {inventory_to_use})),
+                    shards=fact_cfg.warm_shards,
+                ),
+                cfg.runner.use_uvloop,
+            )
+            return 0 if all(r.returncode == 0 for r in results) else 1
+
         # 2. Extra Vars: Start with config defaults, then override with CLI vars
         extra_vars = cfg.ansible.default_extra_vars.copy()
 
@@ -98,16 +221,146 @@ def main() -> int:
         dry_run_flag = args.dry_run
         use_async_flag = args.use_async or cfg.runner.enable_async
 
-        if use_async_flag:
-            return asyncio.run(
-                runner.run_playbook_async(
-                    playbook_to_run, inventory_to_use, extra_vars, dry_run_flag
+        fact_snapshot = None
+        journal = None
+        try:
+            # Open the execution journal only for real runs (closed in finally),
+            # before any job starts, so a resumed run can skip finished jobs
+            if args.journal:
+                journal = open_journal(
+                    args.journal,
+                    resume=args.resume,
+                    binary=cfg.ansible.binary,
+                    kill_orphans=args.kill_orphans,
+                    fsync_every=cfg.runner.journal_fsync_every,
+                    fsync_interval=cfg.runner.journal_fsync_interval,
                 )
-            )
-        else:
-            return runner.run_playbook(
-                playbook_to_run, inventory_to_use, extra_vars, dry_run_flag
-            )
+                runner.journal = journal
+
+            spec = load_workflow(args.workflow) if args.workflow else None
+            inventories = {inventory_to_use}
+            if spec is not None:
+                inventories |= {
+                    job.inventory for job in spec.jobs.values() if job.inventory
+                }
+
+            if spec is not None:
+                targets = [
+                    (job.playbook, job.inventory or inventory_to_use)
+                    for job in spec.jobs.values()
+                ]
+            else:
+                targets = [(playbook_to_run, inventory_to_use)]
+
+            # 4. Preflight: syntax-check/list-hosts every playbook, served from cache
+            listed_hosts = {}
+            if args.preflight or cfg.preflight.enabled:
+                checked = runner.preflight(
+                    targets, preflight_cache, workers=cfg.preflight.workers
+                )
+                listed_hosts = {(r.playbook, r.inventory): r.hosts for r in checked}
+
+            # 5. SSH pool: open master connections before the first playbook starts
+            if args.warm_ssh and ssh_pool is not None:
+                ssh_pool.prewarm(
+                    inventory_hosts(cfg.ansible.working_dir, inventories),
+                    workers=cfg.ssh.prewarm_workers,
+                )
+
+            # 6. Workflow: run a DAG of dependent jobs instead of a single playbook
+            if spec is not None:
+                engine = WorkflowEngine(
+                    runner,
+                    spec,
+                    inventory=inventory_to_use,
+                    extra_vars=extra_vars,
+                    dry_run=dry_run_flag,
+                    max_concurrency=args.max_concurrency,
+                    journal=journal,
+                )
+                if fact_cache is not None:
+                    fact_snapshot = fact_cache_snapshot(
+                        runner, fact_cache, targets, listed_hosts
+                    )
+                report = run_async(engine.run(), cfg.runner.use_uvloop)
+                for line in format_report(report):
+                    logger.info(line)
+                return 0 if report.succeeded else 1
+
+            # 7. Incremental: narrow the run to roles/hosts whose inputs changed
+            incremental = args.incremental or cfg.incremental.enabled
+            tags = limit = None
+            if incremental:
+                state = IncrementalState(cfg.incremental.state_file)
+                run_key = f"{playbook_to_run}@{inventory_to_use}"
+                fingerprints = fingerprint_roles(
+                    Path(cfg.ansible.working_dir),
+                    playbook_to_run,
+                    inventory_to_use,
+                    extra_vars,
+                )
+                if args.force_full:
+                    logger.info("Incremental: forced full run")
+                else:
+                    plan = plan_run(fingerprints, state.previous(run_key))
+                    if plan.up_to_date:
+                        logger.info("Incremental: no role inputs changed")
+                        return 0
+                    tags, limit = plan.tags, plan.limit
+                    logger.info(
+                        "Incremental: %d changed role(s): %s (tags=%s, limit=%s)",
+                        len(plan.changed),
+                        ", ".join(plan.changed),
+                        ",".join(tags) if tags else "all",
+                        limit or "all",
+                    )
+
+            # A single playbook run is a one-job batch in the journal
+            job_id = f"{playbook_to_run}@{inventory_to_use}"
+            if journal is not None:
+                if journal.state.is_done(job_id):
+                    logger.info("Job '%s' already completed (journal)", job_id)
+                    return 0
+                journal.submit(job_id)
+
+            if fact_cache is not None:
+                fact_snapshot = fact_cache_snapshot(
+                    runner, fact_cache, targets, listed_hosts, limit
+                )
+
+            if use_async_flag:
+                rc = run_async(
+                    runner.run_playbook_async(
+                        playbook_to_run,
+                        inventory_to_use,
+                        extra_vars,
+                        dry_run_flag,
+                        job_id=job_id,
+                        tags=tags,
+                        limit=limit,
+                    ),
+                    cfg.runner.use_uvloop,
+                )
+            else:
+                rc = runner.run_playbook(
+                    playbook_to_run,
+                    inventory_to_use,
+                    extra_vars,
+                    dry_run_flag,
+                    job_id=job_id,
+                    tags=tags,
+                    limit=limit,
+                )
+
+            # Only a successful real run (not check mode) advances the state
+            if incremental and rc == 0 and not dry_run_flag:
+                state.save(run_key, fingerprints)
+            return rc
+        finally:
+            if fact_snapshot is not None:
+                log_fact_cache_stats(logger, fact_cache, fact_snapshot)
+            if journal is not None:
+                journal.close()
 
     except (RunnerError, ConfigValidationError, ProcessExecutionError) as e:
         log = (
@@ -0,0 +1,121 @@
+"""
+Tests for autotune.py using pytest.
+Focuses on: candidate generation, trial measurement with a fake ansible-playbook, profile selection.
+"""
+
+import stat
+import sys
+
+import pytest
+
+from ansible_runner.autotune import AutoTuner
+from ansible_runner.config_loader import TuningProfile
+from ansible_runner.exceptions import RunnerError
+from ansible_runner.runner import AnsibleRunner
+
+# Simulated run time shrinks with forks and with the free strategy;
+# pipelining makes no difference but costs nothing.
+FAKE_PLAYBOOK = """\
+import os, sys, time
+args = sys.argv[1:]
+forks = int(args[args.index("--forks") + 1])
+if os.environ.get("CALLS_LOG"):
+    with open(os.environ["CALLS_LOG"], "a") as fh:
+        fh.write(f"{forks}\\n")
+delay = 0.2 / forks
+if os.environ.get("ANSIBLE_STRATEGY") == "free":
+    delay /= 2
+time.sleep(delay)
+sys.exit(3 if os.environ.get("FAIL_ALL") else 0)
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "hosts.ini").write_text(
+        "[web]\n" + "".join(f"web{i}\n" for i in range(4))
+    )
+    script = tmp_path / "ansible-playbook"
+    script.write_text(f"#!{sys.executable}\n" + FAKE_PLAYBOOK)
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return tmp_path
+
+
+def test_candidates_collapse_forks_above_host_count(project):
+    runner = AnsibleRunner(
+        working_dir=project, ansible_binary=str(project / "ansible-playbook")
+    )
+    tuner = AutoTuner(
+        runner,
+        "hosts.ini",
+        forks=[1, 2, 10, 50],
+        strategies=["linear"],
+        pipelining=[False],
+    )
+    assert [c.forks for c in tuner.candidates()] == [1, 2, 4]
+
+
+def test_autotune_picks_fastest_profile(project):
+    runner = AnsibleRunner(
+        working_dir=project, ansible_binary=str(project / "ansible-playbook")
+    )
+    tuner = AutoTuner(
+        runner,
+        "hosts.ini",
+        forks=[1, 4],
+        strategies=["linear", "free"],
+        pipelining=[False, True],
+    )
+    best, trials = tuner.run()
+
+    assert best.forks == 4 and best.strategy == "free"
+    assert len(trials) == 8
+    assert all(t.returncode == 0 and t.hosts == 4 for t in trials)
+    # The generated calibration playbook is removed afterwards
+    assert not list(project.glob(".autotune-*"))
+
+
+def test_autotune_warms_up_then_interleaves_trials(project, monkeypatch):
+    calls = project / "calls.log"
+    monkeypatch.setenv("CALLS_LOG", str(calls))
+    runner = AnsibleRunner(
+        working_dir=project, ansible_binary=str(project / "ansible-playbook")
+    )
+    tuner = AutoTuner(
+        runner,
+        "hosts.ini",
+        forks=[1, 4],
+        strategies=["linear"],
+        pipelining=[False],
+        trials=2,
+    )
+    _, trials = tuner.run()
+
+    # The discarded warm-up uses the most forks; rounds alternate candidates
+    assert calls.read_text().split() == ["4", "1", "4", "1", "4"]
+    assert [t.profile.forks for t in trials] == [1, 4]
+
+
+def test_autotune_raises_when_every_pass_fails(project, monkeypatch):
+    monkeypatch.setenv("FAIL_ALL", "1")
+    runner = AnsibleRunner(
+        working_dir=project, ansible_binary=str(project / "ansible-playbook")
+    )
+    tuner = AutoTuner(
+        runner, "hosts.ini", forks=[2], strategies=["linear"], pipelining=[False]
+    )
+    with pytest.raises(RunnerError):
+        tuner.run()
+
+
+def test_saved_profile_is_applied_to_later_runs(project):
+    (project / "site.yml").write_text("- hosts: all\n")
+    profile = TuningProfile(forks=25, strategy="free", pipelining=True)
+    runner = AnsibleRunner(working_dir=project, tuning_profiles={"hosts.ini": profile})
+
+    cmd = runner._build_command("site.yml", "hosts.ini")
+    assert cmd[-2:] == ["--forks", "25"]
+    env = runner._build_env("hosts.ini")
+    assert env["ANSIBLE_STRATEGY"] == "free"
+    assert env["ANSIBLE_PIPELINING"] == "True"
+    assert "--forks" not in runner._build_command("site.yml")
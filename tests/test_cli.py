@@ -46,3 +46,11 @@ def test_cli_invalid_extra_vars(monkeypatch):
     args = parse_args()
     assert isinstance(args.extra_vars, list)
     assert args.extra_vars[0] == "{not-valid-json"
+
+
+def test_cli_rejects_non_positive_max_concurrency(monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ["script", "--config", "config.yaml", "--max-concurrency", "-1"])
+    with pytest.raises(SystemExit):
+        parse_args()
+    monkeypatch.setattr(sys, 'argv', ["script", "--config", "config.yaml", "--max-concurrency", "3"])
+    assert parse_args().max_concurrency == 3
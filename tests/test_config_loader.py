@@ -52,3 +52,39 @@ def test_invalid_yaml(tmp_path):
     cfg_file.write_text(":::not-valid-yaml:::")
     with pytest.raises(ConfigValidationError):
         load_config(str(cfg_file))
+
+
+def test_save_tuning_profile_roundtrip(tmp_path):
+    from ansible_runner.config_loader import TuningProfile, save_tuning_profile
+
+    profiles_file = tmp_path / "state" / "profiles.json"
+    cfg_file = tmp_path / "config.yaml"
+    cfg_text = (
+        "# keep this comment\n"
+        + yaml.safe_dump(
+            {
+                "ansible": {
+                    "binary": "ansible-playbook",
+                    "default_playbook": "site.yml",
+                    "default_inventory": "hosts.ini",
+                },
+                "logging": {},
+                "runner": {},
+                "tuning": {
+                    "profiles_file": str(profiles_file),
+                    "profiles": {"pinned.ini": {"forks": 3}},
+                },
+            }
+        )
+    )
+    cfg_file.write_text(cfg_text)
+    save_tuning_profile(str(profiles_file), "hosts.ini", TuningProfile(forks=20, strategy="free"))
+    save_tuning_profile(str(profiles_file), "pinned.ini", TuningProfile(forks=50))
+
+    config = load_config(str(cfg_file))
+    assert config.tuning.profiles["hosts.ini"].forks == 20
+    assert config.tuning.profiles["hosts.ini"].strategy == "free"
+    # Profiles pinned in the config win over measured ones
+    assert config.tuning.profiles["pinned.ini"].forks == 3
+    assert config.ansible.default_playbook == "site.yml"
+    assert cfg_file.read_text() == cfg_text
@@ -0,0 +1,107 @@
+"""
+Tests for facts.py using pytest.
+Focuses on: cache env injection, TTL freshness, hit/miss accounting, sharded warming.
+"""
+
+import asyncio
+import os
+import time
+
+from ansible_runner.exceptions import ProcessExecutionError
+from ansible_runner.facts import FACT_PREFIX, FactCache, shard_hosts, warm_facts
+from ansible_runner.runner import AnsibleRunner
+
+
+def _write_entry(cache, host, age=0.0):
+    path = cache.entry_path(host)
+    path.write_text("{}")
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+def test_env_points_ansible_at_cache(tmp_path):
+    cache = FactCache(tmp_path / "facts", ttl_seconds=600)
+    env = cache.env()
+    assert env["ANSIBLE_CACHE_PLUGIN"] == "jsonfile"
+    assert env["ANSIBLE_CACHE_PLUGIN_CONNECTION"] == str(tmp_path / "facts")
+    assert env["ANSIBLE_CACHE_PLUGIN_PREFIX"] == FACT_PREFIX
+    assert env["ANSIBLE_CACHE_PLUGIN_TIMEOUT"] == "600"
+    assert env["ANSIBLE_GATHERING"] == "smart"
+    assert (tmp_path / "facts").is_dir()
+
+    runner = AnsibleRunner(working_dir=tmp_path, fact_cache=cache)
+    assert runner._build_env()["ANSIBLE_GATHERING"] == "smart"
+
+
+def test_fresh_hosts_respects_ttl(tmp_path):
+    cache = FactCache(tmp_path, ttl_seconds=3600)
+    _write_entry(cache, "web01", age=60)
+    _write_entry(cache, "web02", age=7200)
+    assert cache.fresh_hosts(["web01", "web02", "web03"]) == {"web01"}
+
+    never_expires = FactCache(tmp_path, ttl_seconds=0)
+    assert never_expires.fresh_hosts(["web01", "web02", "web03"]) == {"web01", "web02"}
+
+
+def test_stats_counts_hits_and_gathered_misses(tmp_path):
+    cache = FactCache(tmp_path, ttl_seconds=3600)
+    hosts = ["web01", "web02", "db01", "db02"]
+    _write_entry(cache, "web01", age=60)
+    _write_entry(cache, "web02", age=60)
+    _write_entry(cache, "db02", age=7200)
+    before = cache.snapshot(hosts)
+    taken_at = time.time()
+
+    # During the run: db01 gathered for the first time, db02 re-gathered
+    _write_entry(cache, "db01")
+    _write_entry(cache, "db02")
+
+    stats = cache.stats(before, taken_at)
+    assert (stats.hits, stats.misses) == (2, 2)
+    assert stats.hit_rate == 0.5
+
+
+def test_stats_ignores_hosts_not_reached(tmp_path):
+    cache = FactCache(tmp_path, ttl_seconds=3600)
+    _write_entry(cache, "web01", age=7200)
+    before = cache.snapshot(["web01", "unreachable"])
+    stats = cache.stats(before, time.time())
+    assert stats.total == 0
+    assert stats.hit_rate == 0.0
+
+
+def test_shard_hosts_round_robin():
+    hosts = [f"h{i}" for i in range(7)]
+    shards = shard_hosts(hosts, 3)
+    assert shards == [["h0", "h3", "h6"], ["h1", "h4"], ["h2", "h5"]]
+    assert shard_hosts(hosts[:2], 8) == [["h0"], ["h1"]]
+
+
+def test_warm_facts_runs_shards_concurrently(tmp_path):
+    class Runner:
+        working_dir = tmp_path
+
+        def __init__(self):
+            self.calls = []
+            self.active = self.peak = 0
+
+        async def run_playbook_async(self, playbook, inventory=None, limit=None):
+            assert "setup" in (tmp_path / playbook).read_text()
+            self.calls.append(limit)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            await asyncio.sleep(0.01)
+            self.active -= 1
+            if "bad" in limit:
+                raise ProcessExecutionError(4)
+            return 0
+
+    runner = Runner()
+    hosts = ["web01", "web02", "bad01", "db01"]
+    results = asyncio.run(warm_facts(runner, "hosts.ini", hosts, shards=2))
+
+    assert sorted(runner.calls) == ["web01,bad01", "web02,db01"]
+    assert runner.peak == 2
+    assert [r.returncode for r in results] == [4, 0]
+    # The generated playbook is removed afterwards
+    assert list(tmp_path.glob(".warm-facts-*")) == []
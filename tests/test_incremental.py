@@ -0,0 +1,206 @@
+"""
+Tests for incremental.py using pytest.
+Focuses on: per-role fingerprints, change planning (--tags/--limit), state persistence.
+"""
+
+import pytest
+
+from ansible_runner.incremental import (
+    PLAY_TASKS,
+    IncrementalState,
+    fingerprint_roles,
+    plan_run,
+)
+from ansible_runner.runner import AnsibleRunner
+
+SITE = """\
+- hosts: web
+  roles:
+    - {role: nginx, tags: [nginx]}
+    - {role: app, tags: [app]}
+- hosts: db
+  roles:
+    - {role: postgres, tags: [postgres]}
+- hosts: monitoring
+  roles:
+    - exporter
+  tasks:
+    - debug: msg=hello
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    for role in ("nginx", "app", "postgres", "exporter", "common"):
+        (tmp_path / "roles" / role / "tasks").mkdir(parents=True)
+        (tmp_path / "roles" / role / "tasks" / "main.yml").write_text(
+            f"- debug: msg={role}\n"
+        )
+    (tmp_path / "roles" / "app" / "meta").mkdir()
+    (tmp_path / "roles" / "app" / "meta" / "main.yml").write_text(
+        "dependencies: [common]\n"
+    )
+    (tmp_path / "site.yml").write_text(SITE)
+    (tmp_path / "hosts.ini").write_text(
+        "[web]\nweb01\n[db]\ndb01\n[monitoring]\nmon01\n"
+    )
+    return tmp_path
+
+
+def _fingerprint(project, extra_vars=None):
+    return fingerprint_roles(project, "site.yml", "hosts.ini", extra_vars or {})
+
+
+def _previous(fps):
+    return {k: fp.digest for k, fp in fps.items()}
+
+
+def test_fingerprint_keys(project):
+    assert sorted(_fingerprint(project)) == sorted(
+        [
+            "web::nginx",
+            "web::app",
+            "db::postgres",
+            "monitoring::exporter",
+            f"monitoring::{PLAY_TASKS}",
+        ]
+    )
+
+
+def test_unchanged_inputs_need_no_run(project):
+    fps = _fingerprint(project)
+    assert plan_run(_fingerprint(project), _previous(fps)).up_to_date
+
+
+def test_role_dependency_change_limits_to_its_hosts_and_tag(project):
+    before = _previous(_fingerprint(project))
+    (project / "roles" / "common" / "tasks" / "main.yml").write_text(
+        "- debug: msg=changed\n"
+    )
+
+    plan = plan_run(_fingerprint(project), before)
+    assert plan.changed == ["web::app"]
+    assert plan.tags == ["app"]
+    assert plan.limit == "web"
+
+
+def test_group_vars_change_affects_only_that_group(project):
+    before = _previous(_fingerprint(project))
+    (project / "group_vars").mkdir()
+    (project / "group_vars" / "db.yml").write_text("pg_version: 16\n")
+
+    plan = plan_run(_fingerprint(project), before)
+    assert plan.changed == ["db::postgres"]
+    assert plan.limit == "db"
+
+
+def test_extra_vars_change_reruns_everything(project):
+    before = _previous(_fingerprint(project, {"release": "1"}))
+    plan = plan_run(_fingerprint(project, {"release": "2"}), before)
+    assert len(plan.changed) == 5
+    # Untagged roles and play tasks cannot be selected with --tags
+    assert plan.tags is None
+    assert plan.limit == "db,monitoring,web"
+
+
+def test_state_roundtrip(project, tmp_path):
+    state = IncrementalState(tmp_path / "state" / "incremental.json")
+    assert state.previous("site.yml@hosts.ini") == {}
+    fps = _fingerprint(project)
+    state.save("site.yml@hosts.ini", fps)
+    assert state.previous("site.yml@hosts.ini") == _previous(fps)
+
+
+def test_build_command_with_tags_and_limit(project):
+    runner = AnsibleRunner(working_dir=project)
+    cmd = runner._build_command(
+        "site.yml", "hosts.ini", tags=["app", "nginx"], limit="web"
+    )
+    assert cmd[-4:] == ["--tags", "app,nginx", "--limit", "web"]
+
+
+def test_exclusion_patterns_drop_limit(tmp_path):
+    for role in ("a", "b"):
+        (tmp_path / "roles" / role / "tasks").mkdir(parents=True)
+        (tmp_path / "roles" / role / "tasks" / "main.yml").write_text(
+            "- debug: msg=v1\n"
+        )
+    (tmp_path / "site.yml").write_text(
+        "- hosts: all:!db\n  roles: [{role: a, tags: [a]}]\n"
+        "- hosts: db\n  roles: [{role: b, tags: [b]}]\n"
+    )
+    before = _previous(fingerprint_roles(tmp_path, "site.yml"))
+    for role in ("a", "b"):
+        (tmp_path / "roles" / role / "tasks" / "main.yml").write_text(
+            "- debug: msg=v2\n"
+        )
+
+    plan = plan_run(fingerprint_roles(tmp_path, "site.yml"), before)
+    # "all:!db,db" would exclude db and role b would never run
+    assert plan.limit is None
+    assert plan.tags == ["a", "b"]
+
+
+def test_host_vars_change_limits_to_that_host(project):
+    (project / "host_vars").mkdir()
+    (project / "host_vars" / "web01.yml").write_text("port: 80\n")
+    (project / "host_vars" / "db01.yml").write_text("pg: 15\n")
+    before = _previous(_fingerprint(project))
+
+    (project / "host_vars" / "web01.yml").write_text("port: 8080\n")
+    plan = plan_run(_fingerprint(project), before)
+    assert plan.changed == ["web01::__host_vars__"]
+    assert plan.limit == "web01"
+    # Any role on the host may read the variable
+    assert plan.tags is None
+
+    (project / "host_vars" / "db01.yml").unlink()
+    plan = plan_run(_fingerprint(project), before)
+    assert plan.limit == "db01,web01"
+
+
+def test_parent_and_child_group_vars_are_fingerprinted(project):
+    (project / "hosts.ini").write_text(
+        "[web_eu]\nweb01\n[web:children]\nweb_eu\n[prod:children]\nweb\n"
+        "[db]\ndb01\n[monitoring]\nmon01\n"
+    )
+    (project / "group_vars").mkdir()
+    before = _previous(_fingerprint(project))
+
+    (project / "group_vars" / "web_eu.yml").write_text("region: eu\n")
+    plan = plan_run(_fingerprint(project), before)
+    assert sorted(plan.changed) == ["web::app", "web::nginx"]
+    assert plan.limit == "web"
+
+    (project / "group_vars" / "web_eu.yml").unlink()
+    (project / "group_vars" / "prod.yml").write_text("env: prod\n")
+    plan = plan_run(_fingerprint(project), before)
+    assert sorted(plan.changed) == ["web::app", "web::nginx"]
+
+
+def test_unresolvable_pattern_hashes_all_group_vars(project):
+    (project / "site.yml").write_text("- hosts: 'web*'\n  roles: [nginx]\n")
+    (project / "group_vars").mkdir()
+    before = _previous(_fingerprint(project))
+
+    (project / "group_vars" / "anything.yml").write_text("x: 1\n")
+    assert plan_run(_fingerprint(project), before).changed == ["web*::nginx"]
+
+
+def test_play_task_includes_and_templates_are_fingerprinted(project):
+    (project / "site.yml").write_text(
+        "- hosts: web\n" "  tasks:\n" "    - import_tasks: tasks/common.yml\n"
+    )
+    (project / "tasks").mkdir()
+    (project / "tasks" / "common.yml").write_text("- include_tasks: nested.yml\n")
+    (project / "tasks" / "nested.yml").write_text("- debug: msg=v1\n")
+    (project / "templates").mkdir()
+    (project / "templates" / "motd.j2").write_text("v1\n")
+    before = _previous(_fingerprint(project))
+
+    (project / "tasks" / "nested.yml").write_text("- debug: msg=v2\n")
+    assert plan_run(_fingerprint(project), before).changed == [f"web::{PLAY_TASKS}"]
+
+    (project / "tasks" / "nested.yml").write_text("- debug: msg=v1\n")
+    (project / "templates" / "motd.j2").write_text("v2\n")
+    assert plan_run(_fingerprint(project), before).changed == [f"web::{PLAY_TASKS}"]
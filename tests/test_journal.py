@@ -0,0 +1,159 @@
+"""
+Tests for journal.py using pytest.
+Focuses on: ExecutionJournal append/replay, fsync batching, resume and orphan detection.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+
+from ansible_runner import journal as journal_mod
+from ansible_runner.exceptions import RunnerError
+from ansible_runner.journal import (
+    ExecutionJournal,
+    find_orphans,
+    open_journal,
+    replay_journal,
+)
+from ansible_runner.workflow import SUCCEEDED, WorkflowEngine, WorkflowSpec
+
+
+def test_replay_reconstructs_state(tmp_path):
+    path = tmp_path / "batch.journal"
+    with ExecutionJournal(path) as j:
+        for job in ("a", "b", "c"):
+            j.submit(job)
+        j.start("a", 100)
+        j.complete("a", 0)
+        j.start("b", 101)
+        j.complete("b", 2)
+        j.start("c", 102)
+
+    state = replay_journal(path)
+    assert state.submitted == ["a", "b", "c"]
+    assert state.is_done("a")
+    assert not state.is_done("b")
+    assert state.running == {"c": 102}
+    assert state.incomplete() == ["b", "c"]
+
+
+def test_replay_ignores_torn_trailing_record(tmp_path):
+    path = tmp_path / "batch.journal"
+    with ExecutionJournal(path) as j:
+        j.submit("a")
+        j.complete("a", 0)
+    with path.open("a") as fh:
+        fh.write('{"event": "comp')
+
+    assert replay_journal(path).is_done("a")
+
+
+def test_fsync_is_batched(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(journal_mod.os, "fsync", lambda fd: calls.append(fd))
+    j = ExecutionJournal(tmp_path / "batch.journal", fsync_every=4, fsync_interval=3600)
+    for i in range(7):
+        j.submit(f"job{i}")
+    # session record + 7 submits = 8 records -> two batches of four
+    assert len(calls) == 2
+    j.close()
+    assert len(calls) == 2  # nothing left unsynced
+
+
+def test_open_journal_requires_resume_for_existing_file(tmp_path):
+    path = tmp_path / "batch.journal"
+    ExecutionJournal(path).close()
+    with pytest.raises(RunnerError):
+        open_journal(str(path), resume=False)
+    open_journal(str(path), resume=True).close()
+
+
+def test_second_controller_cannot_open_journal(tmp_path):
+    path = tmp_path / "batch.journal"
+    with ExecutionJournal(path) as first:
+        first.submit("a")
+        with pytest.raises(RunnerError, match=f"pid {os.getpid()}"):
+            open_journal(str(path), resume=True, kill_orphans=True)
+        assert first.state.controller_pid == os.getpid()
+    # Released on close
+    with open_journal(str(path), resume=True) as second:
+        assert second.previous_controller == os.getpid()
+
+
+def test_replay_skips_records_without_job(tmp_path):
+    path = tmp_path / "batch.journal"
+    path.write_text('{"event": "submit"}\n{"event": "start", "job": null}\n')
+    state = replay_journal(path)
+    assert state.submitted == [] and state.running == {}
+
+
+def test_find_orphans_detects_live_child(tmp_path):
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        path = tmp_path / "batch.journal"
+        with ExecutionJournal(path) as j:
+            j.submit("live")
+            j.start("live", child.pid)
+            j.submit("dead")
+            j.start("dead", 2**22 + 1)
+
+        state = replay_journal(path)
+        assert find_orphans(state, binary="ansible-playbook") == []
+        orphans = find_orphans(state, binary=os.path.basename(sys.executable))
+        assert [(o.job, o.pid) for o in orphans] == [("live", child.pid)]
+
+        with pytest.raises(RunnerError):
+            open_journal(str(path), resume=True, binary=sys.executable)
+        open_journal(
+            str(path), resume=True, binary=sys.executable, kill_orphans=True
+        ).close()
+        # open_journal returns only after the orphan has exited
+        assert child.poll() is not None and child.returncode != 0
+    finally:
+        child.kill()
+        child.wait()
+
+
+def test_workflow_resume_skips_completed_jobs(tmp_path):
+    class Runner:
+        def __init__(self):
+            self.ran = []
+
+        async def run_playbook_async(
+            self,
+            playbook,
+            inventory=None,
+            extra_vars=None,
+            dry_run=False,
+            job_id=None,
+            priority_class=None,
+        ):
+            self.ran.append(job_id)
+            return 0
+
+    spec = WorkflowSpec.model_validate(
+        {
+            "jobs": {
+                "a": {"playbook": "a.yml"},
+                "b": {"playbook": "b.yml", "needs": ["a"]},
+            }
+        }
+    )
+    path = tmp_path / "batch.journal"
+    with ExecutionJournal(path) as j:
+        j.submit("a")
+        j.start("a", None)
+        j.complete("a", 0)
+        j.submit("b")
+
+    runner = Runner()
+    with open_journal(str(path), resume=True) as j:
+        report = asyncio.run(WorkflowEngine(runner, spec, journal=j).run())
+
+    assert runner.ran == ["b"]
+    assert report.results["a"].status == SUCCEEDED
+    assert report.results["b"].status == SUCCEEDED
+    assert replay_journal(path).submitted == ["a", "b"]
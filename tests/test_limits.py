@@ -0,0 +1,136 @@
+"""
+Tests for limits.py and priority classes on AnsibleRunner.
+Focuses on: nice/rlimit application to a live child, ionice invocation, cgroup v2 placement.
+"""
+
+import os
+import resource
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ansible_runner import limits
+from ansible_runner.config_loader import ResourcePolicy
+from ansible_runner.exceptions import RunnerError
+from ansible_runner.runner import AnsibleRunner
+
+
+@pytest.fixture
+def child():
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    yield proc
+    proc.kill()
+    proc.wait()
+
+
+def test_apply_policy_sets_nice_and_rlimits(child):
+    base = os.getpriority(os.PRIO_PROCESS, os.getpid())
+    limits.apply_policy(
+        child.pid, ResourcePolicy(nice=min(base + 5, 19), rlimit_nofile=64)
+    )
+
+    assert os.getpriority(os.PRIO_PROCESS, child.pid) == min(base + 5, 19)
+    assert resource.prlimit(child.pid, resource.RLIMIT_NOFILE) == (64, 64)
+
+
+def test_apply_policy_failures_are_logged_not_raised(caplog):
+    # A pid that does not exist makes every step fail
+    limits.apply_policy(2**22 + 7, ResourcePolicy(nice=5, rlimit_nofile=64))
+    assert "Could not apply nice" in caplog.text
+
+
+def test_ionice_invocation(monkeypatch):
+    monkeypatch.setattr(limits.shutil, "which", lambda name: "/usr/bin/ionice")
+    run = MagicMock(return_value=MagicMock(returncode=0))
+    monkeypatch.setattr(limits.subprocess, "run", run)
+
+    limits.apply_policy(
+        1234, ResourcePolicy(ionice_class="best-effort", ionice_level=6)
+    )
+    assert run.call_args.args[0] == [
+        "/usr/bin/ionice",
+        "-c",
+        "2",
+        "-n",
+        "6",
+        "-p",
+        "1234",
+    ]
+
+    limits.apply_policy(1234, ResourcePolicy(ionice_class="idle", ionice_level=6))
+    assert run.call_args.args[0] == ["/usr/bin/ionice", "-c", "3", "-p", "1234"]
+
+
+def test_cgroup_placement(tmp_path):
+    (tmp_path / "cgroup.controllers").write_text("cpu memory\n")
+    policy = ResourcePolicy(cgroup="ansible/bulk", cgroup_settings={"cpu.weight": "20"})
+    limits.apply_policy(4321, policy, cgroup_root=str(tmp_path))
+
+    group = tmp_path / "ansible" / "bulk"
+    assert (group / "cgroup.procs").read_text() == "4321"
+    assert (group / "cpu.weight").read_text() == "20"
+
+
+def test_cgroup_skipped_without_v2(tmp_path, caplog):
+    limits.apply_policy(
+        4321, ResourcePolicy(cgroup="ansible"), cgroup_root=str(tmp_path)
+    )
+    assert not (tmp_path / "ansible").exists()
+    assert "cgroup v2 not available" in caplog.text
+
+
+@patch("ansible_runner.runner.apply_policy")
+@patch("subprocess.Popen")
+def test_runner_applies_priority_class(mock_popen, mock_apply, tmp_path):
+    (tmp_path / "playbook.yml").write_text("fake playbook")
+    bulk = ResourcePolicy(nice=10)
+    interactive = ResourcePolicy(nice=0)
+    runner = AnsibleRunner(
+        working_dir=tmp_path,
+        priority_classes={"bulk": bulk, "interactive": interactive},
+        default_priority_class="bulk",
+    )
+    mock_proc = MagicMock(pid=999, stdout=None, stderr=None, returncode=0)
+    mock_popen.return_value = mock_proc
+
+    runner.run_playbook("playbook.yml")
+    mock_apply.assert_called_with(999, bulk)
+    runner.run_playbook("playbook.yml", priority_class="interactive")
+    mock_apply.assert_called_with(999, interactive)
+
+    with pytest.raises(RunnerError):
+        runner.run_playbook("playbook.yml", priority_class="realtime")
+
+
+def test_cgroup_must_stay_below_mount():
+    assert ResourcePolicy(cgroup="ansible/bulk").cgroup == "ansible/bulk"
+    for bad in ("/etc", "../escape", "ansible/../../etc", ""):
+        with pytest.raises(ValueError):
+            ResourcePolicy(cgroup=bad)
+    for bad in ("../../../escaped", "sub/cpu.weight", "..", ""):
+        with pytest.raises(ValueError):
+            ResourcePolicy(cgroup="ansible", cgroup_settings={bad: "x"})
+
+
+def test_async_run_applies_policy_off_the_event_loop(tmp_path, monkeypatch):
+    import asyncio
+    import threading
+
+    (tmp_path / "playbook.yml").write_text("- hosts: all\n")
+    policy = ResourcePolicy(nice=10)
+    runner = AnsibleRunner(
+        working_dir=tmp_path,
+        ansible_binary="true",
+        priority_classes={"bulk": policy},
+    )
+    calls = []
+    monkeypatch.setattr(
+        "ansible_runner.runner.apply_policy",
+        lambda pid, p: calls.append((p, threading.current_thread())),
+    )
+
+    asyncio.run(runner.run_playbook_async("playbook.yml", priority_class="bulk"))
+    assert calls[0][0] is policy
+    assert calls[0][1] is not threading.main_thread()
@@ -7,6 +7,8 @@ import pytest
 import logging
 import logging.handlers
 import tempfile
+import io
+import time
 import os
 from pathlib import Path
 from ansible_runner import logger
@@ -77,3 +79,84 @@ def test_get_logger_creates_logfile_directory(tmp_path):
     assert not subdir.exists()
     test_logger = logger.get_logger("test_dir", logfile=str(logfile))
     assert subdir.exists()
+
+
+PLAYBOOK_OUTPUT = [
+    "PLAY [web] *********************************************************",
+    "TASK [Gathering Facts] *********************************************",
+    "ok: [web01]",
+    "ok: [web02]",
+    "fatal: [web03]: UNREACHABLE! => {\"changed\": false}",
+    "TASK [nginx : install] *********************************************",
+    "changed: [web01]",
+    "ok: [web02 -> localhost]",
+    "fatal: [web02]: FAILED! => {\"msg\": \"boom\"}",
+    "...ignoring",
+    "failed: [web01] (item=conf) => {\"msg\": \"bad\"}",
+]
+
+
+def _feed(log, lines):
+    for line in lines:
+        log.info(line, extra=logger.STREAM_EXTRA)
+
+
+def test_get_logger_progress_mode_uses_progress_handler():
+    test_logger = logger.get_logger("test_progress_mode", console_mode="progress")
+    assert isinstance(test_logger.handlers[0], logger.ProgressConsoleHandler)
+
+
+def test_progress_handler_aggregates_host_states():
+    stream = io.StringIO()
+    handler = logger.ProgressConsoleHandler(stream, refresh_hz=1e-9)
+    log = logging.getLogger("test_progress_states")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    log.addHandler(handler)
+    _feed(log, PLAYBOOK_OUTPUT)
+
+    assert handler.counts() == {"ok": 1, "changed": 0, "failed": 1, "unreachable": 1}
+    assert handler.task == "nginx : install"
+    assert handler.lines == len(PLAYBOOK_OUTPUT)
+    assert stream.getvalue() == ""  # refresh interval not reached yet
+
+    handler.close()
+    out = stream.getvalue()
+    assert "ok=1 changed=0 failed=1 unreachable=1" in out
+    assert "[progress] failed: web01" in out
+    assert "[progress] unreachable: web03" in out
+
+
+def test_progress_handler_caps_refresh_rate_and_passes_other_records():
+    stream = io.StringIO()
+    handler = logger.ProgressConsoleHandler(stream, refresh_hz=20)
+    log = logging.getLogger("test_progress_rate")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    log.addHandler(handler)
+
+    _feed(log, ["ok: [web01]"])
+    time.sleep(0.06)
+    _feed(log, ["ok: [web02]"] * 500)
+    frames = [l for l in stream.getvalue().splitlines() if l.startswith("[progress]")]
+    assert 1 <= len(frames) <= 2
+
+    log.warning("not playbook output")
+    assert "not playbook output" in stream.getvalue()
+    log.removeHandler(handler)
+
+
+def test_progress_handler_passes_through_stream_errors():
+    stream = io.StringIO()
+    handler = logger.ProgressConsoleHandler(stream, refresh_hz=1e-9)
+    log = logging.getLogger("test_progress_stderr")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    log.addHandler(handler)
+
+    log.error("ERROR! the role 'nginx' was not found", extra=logger.STREAM_EXTRA)
+    log.info("ok: [web01]", extra=logger.STREAM_EXTRA)
+    assert "ERROR! the role 'nginx' was not found" in stream.getvalue()
+    assert "ok: [web01]" not in stream.getvalue()
+    assert handler.counts()["ok"] == 1
+    log.removeHandler(handler)
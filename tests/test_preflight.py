@@ -0,0 +1,175 @@
+"""
+Tests for preflight.py and AnsibleRunner.preflight using pytest.
+Focuses on: content hashing, list-hosts parsing, the size-bounded cache and cache hits.
+"""
+
+import os
+import stat
+import time
+
+import pytest
+
+from ansible_runner.exceptions import PreflightError
+from ansible_runner.preflight import PreflightCache, content_hash, parse_list_hosts
+from ansible_runner.runner import AnsibleRunner
+
+LIST_HOSTS_OUTPUT = """
+playbook: site.yml
+
+  play #1 (web): web\tTAGS: []
+    pattern: ['web']
+    hosts (2):
+      web01
+      web02
+
+  play #2 (db): db\tTAGS: []
+    pattern: ['db']
+    hosts (1):
+      db01
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "roles" / "nginx" / "tasks").mkdir(parents=True)
+    (tmp_path / "roles" / "nginx" / "tasks" / "main.yml").write_text(
+        "- debug: msg=hi\n"
+    )
+    (tmp_path / "roles" / "unused").mkdir()
+    (tmp_path / "roles" / "unused" / "main.yml").write_text("x: 1\n")
+    (tmp_path / "site.yml").write_text("- hosts: web\n  roles:\n    - nginx\n")
+    (tmp_path / "hosts.ini").write_text("[web]\nweb01\nweb02\n")
+    return tmp_path
+
+
+@pytest.fixture
+def fake_ansible(tmp_path):
+    """A fake ansible-playbook that logs each call and prints --list-hosts output."""
+    script = tmp_path / "bin" / "ansible-playbook"
+    script.parent.mkdir()
+    script.write_text(
+        "#!/bin/sh\n"
+        f'echo "$@" >> "{tmp_path}/calls.log"\n'
+        'case "$*" in *broken*) echo "syntax error" >&2; exit 4;; esac\n'
+        'case "$*" in *--list-hosts*) printf "  play #1 (web):\\n    hosts (1):\\n      web01\\n";; esac\n'
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return script
+
+
+def test_parse_list_hosts():
+    assert parse_list_hosts(LIST_HOSTS_OUTPUT) == ["web01", "web02", "db01"]
+
+
+def test_content_hash_tracks_referenced_inputs_only(project):
+    base = content_hash(project, "site.yml", "hosts.ini")
+    (project / "roles" / "unused" / "main.yml").write_text("x: 2\n")
+    assert content_hash(project, "site.yml", "hosts.ini") == base
+
+    (project / "roles" / "nginx" / "tasks" / "main.yml").write_text(
+        "- debug: msg=bye\n"
+    )
+    changed = content_hash(project, "site.yml", "hosts.ini")
+    assert changed != base
+
+    (project / "group_vars").mkdir()
+    (project / "group_vars" / "web.yml").write_text("port: 80\n")
+    assert content_hash(project, "site.yml", "hosts.ini") != changed
+
+
+def test_content_hash_follows_configured_roles_path(project, tmp_path, monkeypatch):
+    monkeypatch.delenv("ANSIBLE_ROLES_PATH", raising=False)
+    monkeypatch.delenv("ANSIBLE_CONFIG", raising=False)
+    shared = tmp_path / "shared_roles" / "base" / "tasks"
+    shared.mkdir(parents=True)
+    (shared / "main.yml").write_text("- debug: msg=v1\n")
+    (project / "site.yml").write_text("- hosts: web\n  roles:\n    - base\n")
+    (project / "ansible.cfg").write_text("[defaults]\nroles_path = shared_roles\n")
+
+    base = content_hash(project, "site.yml", "hosts.ini")
+    (shared / "main.yml").write_text("- debug: msg=v2\n")
+    from_cfg = content_hash(project, "site.yml", "hosts.ini")
+    assert from_cfg != base
+
+    # ANSIBLE_ROLES_PATH takes precedence over ansible.cfg
+    other = tmp_path / "other_roles" / "base"
+    other.mkdir(parents=True)
+    monkeypatch.setenv("ANSIBLE_ROLES_PATH", str(other.parent))
+    from_env = content_hash(project, "site.yml", "hosts.ini")
+    (shared / "main.yml").write_text("- debug: msg=v3\n")
+    assert content_hash(project, "site.yml", "hosts.ini") == from_env
+
+
+def test_content_hash_follows_imported_task_files(project, tmp_path):
+    (project / "site.yml").write_text(
+        "- hosts: web\n  tasks:\n    - import_tasks: tasks/common.yml\n"
+    )
+    (project / "tasks").mkdir()
+    (project / "tasks" / "common.yml").write_text("- import_tasks: nested.yml\n")
+    (project / "tasks" / "nested.yml").write_text("- include_role: {name: nginx}\n")
+    cache = PreflightCache(tmp_path / "cache")
+    key = content_hash(project, "site.yml", "hosts.ini")
+    cache.put(key, {"syntax_ok": True})
+
+    # A syntax error in an imported file must not be served as "syntax ok"
+    (project / "tasks" / "nested.yml").write_text("- include_role: {name: nginx\n")
+    assert cache.get(content_hash(project, "site.yml", "hosts.ini")) is None
+
+    (project / "tasks" / "nested.yml").write_text("- include_role: {name: nginx}\n")
+    assert content_hash(project, "site.yml", "hosts.ini") == key
+    (project / "roles" / "nginx" / "tasks" / "main.yml").write_text("- debug: msg=x\n")
+    assert content_hash(project, "site.yml", "hosts.ini") != key
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = PreflightCache(tmp_path / "cache", max_bytes=300)
+    for i, key in enumerate(("a", "b", "c")):
+        cache.put(key, {"payload": "x" * 80})
+        past = time.time() - 100 + i
+        os.utime(tmp_path / "cache" / f"{key}.json", (past, past))
+    cache.get("a")  # refresh a, so b is now the oldest
+    cache.put("d", {"payload": "x" * 80})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.clear() == 3
+
+
+def test_preflight_skips_checks_on_cache_hit(project, fake_ansible, tmp_path):
+    runner = AnsibleRunner(working_dir=project, ansible_binary=str(fake_ansible))
+    cache = PreflightCache(tmp_path / "cache")
+
+    first = runner.preflight([("site.yml", "hosts.ini")], cache)
+    assert first[0].hosts == ["web01"] and not first[0].cached
+    calls = (tmp_path / "calls.log").read_text().splitlines()
+    assert len(calls) == 2
+
+    second = runner.preflight([("site.yml", "hosts.ini")], cache)
+    assert second[0].cached and second[0].hosts == ["web01"]
+    assert (tmp_path / "calls.log").read_text().splitlines() == calls
+
+    (project / "hosts.ini").write_text("[web]\nweb01\n")
+    runner.preflight([("site.yml", "hosts.ini")], cache)
+    assert len((tmp_path / "calls.log").read_text().splitlines()) == 4
+
+
+def test_preflight_failure_is_raised_and_not_cached(project, fake_ansible, tmp_path):
+    (project / "broken.yml").write_text("- hosts: all\n")
+    runner = AnsibleRunner(working_dir=project, ansible_binary=str(fake_ansible))
+    cache = PreflightCache(tmp_path / "cache")
+
+    with pytest.raises(PreflightError, match="broken.yml"):
+        runner.preflight(
+            [("site.yml", "hosts.ini"), ("broken.yml", "hosts.ini")], cache
+        )
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 1
+
+
+def test_list_hosts_passes_limit(project, fake_ansible, tmp_path):
+    runner = AnsibleRunner(working_dir=project, ansible_binary=str(fake_ansible))
+
+    assert runner.list_hosts("site.yml", "hosts.ini", limit="web01") == ["web01"]
+    call = (tmp_path / "calls.log").read_text().splitlines()[-1]
+    assert "--limit web01" in call and "--list-hosts" in call
+
+    assert runner.list_hosts("broken.yml", "hosts.ini") == []
@@ -0,0 +1,85 @@
+"""
+Tests for project.py using pytest.
+Focuses on: playbook imports, task includes, role resolution (tasks, meta dependencies, roles_path), ansible.cfg lookup.
+"""
+
+from ansible_runner.project import (
+    ansible_cfg_option,
+    iter_playbooks,
+    play_roles,
+    play_task_files,
+    role_search,
+    roles_in_tasks,
+)
+
+
+def _role(base, name, deps=None):
+    (base / name / "tasks").mkdir(parents=True)
+    (base / name / "tasks" / "main.yml").write_text("- debug: msg=hi\n")
+    if deps:
+        (base / name / "meta").mkdir()
+        (base / name / "meta" / "main.yml").write_text(f"dependencies: {deps}\n")
+
+
+def test_iter_playbooks_follows_imports_once(tmp_path):
+    (tmp_path / "plays").mkdir()
+    (tmp_path / "site.yml").write_text(
+        "- import_playbook: plays/web.yml\n- import_playbook: plays/web.yml\n"
+        "- import_playbook: missing.yml\n"
+    )
+    (tmp_path / "plays" / "web.yml").write_text("- hosts: web\n  tasks: []\n")
+
+    found = [(p.name, plays) for p, plays in iter_playbooks(tmp_path, "site.yml")]
+    assert [name for name, _ in found] == ["site.yml", "web.yml"]
+    assert found[1][1] == [{"hosts": "web", "tasks": []}]
+
+
+def test_roles_in_tasks_searches_blocks():
+    tasks = [
+        {"include_role": {"name": "a"}},
+        {"block": [{"ansible.builtin.import_role": {"name": "b"}}]},
+        {"debug": "msg=x"},
+    ]
+    assert roles_in_tasks(tasks) == {"a", "b"}
+
+
+def test_play_roles_includes_meta_dependencies(tmp_path, monkeypatch):
+    monkeypatch.delenv("ANSIBLE_ROLES_PATH", raising=False)
+    monkeypatch.delenv("ANSIBLE_CONFIG", raising=False)
+    _role(tmp_path / "roles", "app", deps="[common]")
+    _role(tmp_path / "roles", "common")
+    _role(tmp_path / "roles", "unused")
+
+    search = role_search(tmp_path, tmp_path / "site.yml")
+    paths = play_roles({"hosts": "all", "roles": ["app"]}, search)
+    assert [p.name for p in paths] == ["app", "common"]
+
+
+def test_roles_path_from_ansible_cfg(tmp_path, monkeypatch):
+    monkeypatch.delenv("ANSIBLE_ROLES_PATH", raising=False)
+    monkeypatch.delenv("ANSIBLE_CONFIG", raising=False)
+    _role(tmp_path / "galaxy", "base")
+    (tmp_path / "ansible.cfg").write_text("[defaults]\nroles_path = galaxy\n")
+
+    assert ansible_cfg_option(tmp_path, "defaults", "roles_path") == "galaxy"
+    search = role_search(tmp_path, tmp_path / "site.yml")
+    assert [p.name for p in play_roles({"roles": ["base"]}, search)] == ["base"]
+
+
+def test_play_task_files_follow_nested_includes(tmp_path):
+    (tmp_path / "tasks").mkdir()
+    (tmp_path / "tasks" / "common.yml").write_text(
+        "- block:\n    - include_tasks: {file: nested.yml}\n"
+        "- import_tasks: common.yml\n"
+    )
+    (tmp_path / "tasks" / "nested.yml").write_text("- debug: msg=hi\n")
+    play = {
+        "hosts": "all",
+        "pre_tasks": [{"ansible.builtin.import_tasks": "tasks/common.yml"}],
+        "tasks": [{"include_tasks": "{{ os }}.yml"}],
+    }
+    paths = play_task_files(play, tmp_path / "site.yml")
+    assert paths == [
+        tmp_path / "tasks" / "common.yml",
+        tmp_path / "tasks" / "nested.yml",
+    ]
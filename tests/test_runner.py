@@ -88,3 +88,22 @@ async def test_run_playbook_async_success(mock_exec, runner, tmp_path):
 
     rc = await runner.run_playbook_async("playbook.yml")
     assert rc == 0
+
+
+@patch("subprocess.Popen")
+def test_run_playbook_records_journal(mock_popen, tmp_path):
+    pb = tmp_path / "playbook.yml"
+    pb.write_text("fake playbook")
+    journal = MagicMock()
+    runner = AnsibleRunner(working_dir=tmp_path, journal=journal)
+
+    mock_proc = MagicMock()
+    mock_proc.pid = 4242
+    mock_proc.stdout = None
+    mock_proc.stderr = None
+    mock_proc.returncode = 0
+    mock_popen.return_value = mock_proc
+
+    runner.run_playbook("playbook.yml", job_id="site")
+    journal.start.assert_called_once_with("site", 4242)
+    journal.complete.assert_called_once_with("site", 0)
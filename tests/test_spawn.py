@@ -0,0 +1,96 @@
+"""
+Tests for spawn.py using pytest.
+Focuses on: spawn_kwargs per mode, resolve_command, posix_spawn usage, run_async loop selection.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ansible_runner import spawn
+from ansible_runner.runner import AnsibleRunner
+
+
+def test_spawn_kwargs_default_mode(tmp_path):
+    assert spawn.spawn_kwargs("default", tmp_path) == {
+        "cwd": tmp_path,
+        "close_fds": True,
+    }
+
+
+def test_spawn_kwargs_fast_mode_drops_cwd_only_when_current(tmp_path, monkeypatch):
+    assert spawn.spawn_kwargs("fast", tmp_path) == {"cwd": tmp_path, "close_fds": False}
+    monkeypatch.chdir(tmp_path)
+    assert spawn.spawn_kwargs("fast", tmp_path) == {"cwd": None, "close_fds": False}
+
+
+def test_resolve_command_makes_executable_absolute():
+    cmd = spawn.resolve_command("fast", ["sh", "-c", "true"])
+    assert os.path.isabs(cmd[0]) and cmd[1:] == ["-c", "true"]
+    assert spawn.resolve_command("default", ["sh"]) == ["sh"]
+    assert spawn.resolve_command("fast", ["no-such-binary-xyz"]) == [
+        "no-such-binary-xyz"
+    ]
+
+
+@pytest.mark.skipif(
+    not getattr(subprocess, "_USE_POSIX_SPAWN", False), reason="no posix_spawn"
+)
+def test_fast_mode_uses_posix_spawn(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    real = os.posix_spawn
+    calls = []
+
+    def spy(*args, **kwargs):
+        calls.append(args[0])
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(os, "posix_spawn", spy)
+    proc = subprocess.Popen(
+        spawn.resolve_command("fast", ["true"]), **spawn.spawn_kwargs("fast", tmp_path)
+    )
+    assert proc.wait() == 0
+    assert len(calls) == 1
+
+    proc = subprocess.Popen(["true"], **spawn.spawn_kwargs("default", tmp_path))
+    assert proc.wait() == 0
+    assert len(calls) == 1
+
+
+def test_run_async_falls_back_without_uvloop(monkeypatch):
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+    assert not spawn.uvloop_available()
+
+    async def loop_type():
+        return type(asyncio.get_running_loop()).__module__
+
+    assert spawn.run_async(loop_type(), use_uvloop=True).startswith("asyncio")
+
+
+@pytest.mark.skipif(not spawn.uvloop_available(), reason="uvloop not installed")
+def test_run_async_uses_uvloop_when_installed():
+    async def loop_type():
+        return type(asyncio.get_running_loop()).__module__
+
+    assert spawn.run_async(loop_type(), use_uvloop=True).startswith("uvloop")
+
+
+@patch("subprocess.Popen")
+def test_runner_fast_mode_spawn_arguments(mock_popen, tmp_path):
+    (tmp_path / "playbook.yml").write_text("fake playbook")
+    runner = AnsibleRunner(working_dir=tmp_path, ansible_binary="sh", spawn_mode="fast")
+
+    mock_proc = MagicMock()
+    mock_proc.stdout = None
+    mock_proc.stderr = None
+    mock_proc.returncode = 0
+    mock_popen.return_value = mock_proc
+
+    runner.run_playbook("playbook.yml")
+    args, kwargs = mock_popen.call_args
+    assert os.path.isabs(args[0][0])
+    assert kwargs["close_fds"] is False
@@ -0,0 +1,125 @@
+"""
+Tests for ssh_pool.py using pytest.
+Focuses on: environment injection, pre-warming with a fake ssh binary, stale socket GC.
+"""
+
+import socket
+import stat
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ansible_runner.runner import AnsibleRunner
+from ansible_runner.ssh_pool import SSHControlPool
+
+
+@pytest.fixture
+def control_dir(tmp_path):
+    return tmp_path / "cp"
+
+
+@pytest.fixture
+def fake_ssh(tmp_path):
+    """A fake ssh that logs its argv and fails for hosts named 'down'."""
+    script = tmp_path / "ssh"
+    script.write_text(
+        "#!/bin/sh\n"
+        f'echo "$@" >> "{tmp_path}/ssh.log"\n'
+        'case "$*" in *" down true"*) echo "Connection refused" >&2; exit 255;; esac\n'
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return script
+
+
+def test_env_points_ansible_at_shared_control_dir(control_dir, monkeypatch):
+    monkeypatch.delenv("ANSIBLE_SSH_ARGS", raising=False)
+    pool = SSHControlPool(control_dir, persist_seconds=900)
+    env = pool.env()
+    assert "ControlPersist=900s" in env["ANSIBLE_SSH_ARGS"]
+    assert "ControlMaster=auto" in env["ANSIBLE_SSH_ARGS"]
+    assert env["ANSIBLE_SSH_CONTROL_PATH_DIR"] == str(control_dir)
+    assert env["ANSIBLE_SSH_CONTROL_PATH"] == "%(directory)s/%%C"
+    assert stat.S_IMODE(control_dir.stat().st_mode) == 0o700
+
+
+def test_env_keeps_user_ssh_args_from_environment(control_dir, monkeypatch):
+    monkeypatch.setenv(
+        "ANSIBLE_SSH_ARGS",
+        "-o ProxyJump=bastion -o ControlPersist=30s -oControlPath=/tmp/x -A",
+    )
+    args = SSHControlPool(control_dir, persist_seconds=900).env()["ANSIBLE_SSH_ARGS"]
+    assert (
+        args == "-o ProxyJump=bastion -A -o ControlMaster=auto -o ControlPersist=900s"
+    )
+
+
+def test_env_keeps_user_ssh_args_from_ansible_cfg(control_dir, tmp_path, monkeypatch):
+    monkeypatch.delenv("ANSIBLE_SSH_ARGS", raising=False)
+    monkeypatch.delenv("ANSIBLE_CONFIG", raising=False)
+    (tmp_path / "ansible.cfg").write_text(
+        "[ssh_connection]\n"
+        "ssh_args = -o 'ProxyCommand=ssh -W %h:%p jump' -o GSSAPIAuthentication=yes\n"
+    )
+    runner = AnsibleRunner(working_dir=tmp_path, ssh_pool=SSHControlPool(control_dir))
+    args = runner._build_env()["ANSIBLE_SSH_ARGS"]
+    assert args.startswith(
+        "-o 'ProxyCommand=ssh -W %h:%p jump' -o GSSAPIAuthentication=yes"
+    )
+    assert args.endswith("-o ControlMaster=auto -o ControlPersist=600s")
+
+
+def test_prewarm_uses_pool_control_path(control_dir, fake_ssh, tmp_path):
+    pool = SSHControlPool(control_dir, ssh_binary=str(fake_ssh))
+    results = pool.prewarm(
+        {
+            "web01": {
+                "ansible_host": "10.0.0.1",
+                "ansible_port": "2222",
+                "ansible_user": "deploy",
+            },
+            "down": {},
+        }
+    )
+    assert results == {"web01": True, "down": False}
+
+    calls = (tmp_path / "ssh.log").read_text().splitlines()
+    web = next(c for c in calls if "10.0.0.1" in c)
+    assert f"ControlPath={control_dir}/%C" in web
+    assert "Port=2222" in web and "User=deploy" in web
+    assert web.endswith("10.0.0.1 true")
+
+
+def test_gc_removes_only_stale_sockets(control_dir):
+    pool = SSHControlPool(control_dir)
+    pool.ensure_dir()
+
+    live = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    live.bind(str(control_dir / "live"))
+    live.listen(1)
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(control_dir / "stale"))
+    stale.close()  # socket file remains but nobody listens
+    (control_dir / "notes.txt").write_text("not a socket")
+
+    try:
+        assert pool.gc() == 1
+        assert sorted(p.name for p in control_dir.iterdir()) == ["live", "notes.txt"]
+    finally:
+        live.close()
+
+
+@patch("subprocess.Popen")
+def test_runner_injects_pool_env(mock_popen, tmp_path, control_dir):
+    (tmp_path / "playbook.yml").write_text("fake playbook")
+    runner = AnsibleRunner(working_dir=tmp_path, ssh_pool=SSHControlPool(control_dir))
+
+    mock_proc = MagicMock()
+    mock_proc.stdout = None
+    mock_proc.stderr = None
+    mock_proc.returncode = 0
+    mock_popen.return_value = mock_proc
+
+    runner.run_playbook("playbook.yml")
+    env = mock_popen.call_args.kwargs["env"]
+    assert env["ANSIBLE_SSH_CONTROL_PATH_DIR"] == str(control_dir)
+    assert "PATH" in env
@@ -35,3 +35,66 @@ def test_ensure_file_readable_missing(tmp_path):
 def test_which_returns_none_for_nonexistent_binary(monkeypatch):
     monkeypatch.setattr("shutil.which", lambda x: None)
     assert utils.which("some_nonexistent_binary_1234") is None
+
+
+def test_parse_inventory_hosts_ini(tmp_path):
+    inv = tmp_path / "hosts.ini"
+    inv.write_text(
+        "[web]\n"
+        "web[01:03] ansible_user=deploy\n"
+        "db01 ansible_host=10.0.0.5 ansible_port=2222  # primary\n"
+        "[web:vars]\n"
+        "http_port=80\n"
+        "[all:children]\n"
+        "web\n"
+    )
+    hosts = utils.parse_inventory_hosts(str(inv))
+    assert list(hosts) == ["web01", "web02", "web03", "db01"]
+    assert hosts["web02"] == {"ansible_user": "deploy"}
+    assert hosts["db01"] == {"ansible_host": "10.0.0.5", "ansible_port": "2222"}
+
+
+def test_parse_inventory_hosts_yaml(tmp_path):
+    inv = tmp_path / "hosts.yml"
+    inv.write_text(
+        "all:\n"
+        "  children:\n"
+        "    web:\n"
+        "      hosts:\n"
+        "        web01: {ansible_port: 2200}\n"
+        "        web02:\n"
+    )
+    hosts = utils.parse_inventory_hosts(str(inv))
+    assert hosts == {"web01": {"ansible_port": "2200"}, "web02": {}}
+
+
+def test_parse_inventory_groups_resolves_parents(tmp_path):
+    inv = tmp_path / "hosts.ini"
+    inv.write_text(
+        "solo01\n"
+        "[web_eu]\n"
+        "web[01:02]\n"
+        "[webservers:children]\n"
+        "web_eu\n"
+        "[prod:children]\n"
+        "webservers\n"
+        "[prod:vars]\n"
+        "env=prod\n"
+    )
+    groups = utils.parse_inventory_groups(str(inv))
+    assert groups["web02"] == {"all", "web_eu", "webservers", "prod"}
+    assert groups["solo01"] == {"all", "ungrouped"}
+
+
+def test_parse_inventory_groups_yaml(tmp_path):
+    inv = tmp_path / "hosts.yml"
+    inv.write_text(
+        "all:\n"
+        "  children:\n"
+        "    prod:\n"
+        "      children:\n"
+        "        web:\n"
+        "          hosts:\n"
+        "            web01:\n"
+    )
+    assert utils.parse_inventory_groups(str(inv)) == {"web01": {"all", "prod", "web"}}
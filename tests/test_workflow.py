@@ -0,0 +1,146 @@
+"""
+Tests for workflow.py using pytest.
+Focuses on: load_workflow, topological_order, WorkflowEngine scheduling and reporting.
+"""
+
+import asyncio
+import pytest
+import yaml
+
+from ansible_runner.exceptions import ProcessExecutionError, WorkflowError
+from ansible_runner.workflow import (
+    FAILED,
+    SKIPPED,
+    SUCCEEDED,
+    WorkflowEngine,
+    WorkflowSpec,
+    load_workflow,
+    topological_order,
+)
+
+
+class FakeRunner:
+    """Stands in for AnsibleRunner; each playbook sleeps for a fixed duration."""
+
+    def __init__(self, durations, failing=()):
+        self.durations = durations
+        self.failing = set(failing)
+        self.running = 0
+        self.peak = 0
+        self.calls = []
+
+    async def run_playbook_async(
+        self,
+        playbook,
+        inventory=None,
+        extra_vars=None,
+        dry_run=False,
+        job_id=None,
+        priority_class=None,
+    ):
+        self.calls.append((playbook, inventory, extra_vars, dry_run))
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.durations.get(playbook, 0.01))
+        finally:
+            self.running -= 1
+        if playbook in self.failing:
+            raise ProcessExecutionError(2)
+        return 0
+
+
+def _spec(max_concurrency=4):
+    return WorkflowSpec.model_validate(
+        {
+            "max_concurrency": max_concurrency,
+            "jobs": {
+                "base": {"playbook": "base.yml"},
+                "db": {"playbook": "db.yml", "needs": ["base"]},
+                "cache": {"playbook": "cache.yml", "needs": ["base"]},
+                "app": {"playbook": "app.yml", "needs": ["db", "cache"]},
+                "smoke": {"playbook": "smoke.yml", "needs": ["app"]},
+            },
+        }
+    )
+
+
+def test_topological_order_respects_dependencies():
+    order = topological_order(_spec())
+    assert order.index("base") < order.index("db") < order.index("app")
+    assert order.index("cache") < order.index("app") < order.index("smoke")
+
+
+def test_cycle_is_rejected():
+    spec = WorkflowSpec.model_validate(
+        {
+            "jobs": {
+                "a": {"playbook": "a.yml", "needs": ["b"]},
+                "b": {"playbook": "b.yml", "needs": ["a"]},
+            }
+        }
+    )
+    with pytest.raises(WorkflowError):
+        topological_order(spec)
+
+
+def test_duplicate_needs_are_not_a_cycle():
+    spec = WorkflowSpec.model_validate(
+        {
+            "jobs": {
+                "a": {"playbook": "a.yml"},
+                "b": {"playbook": "b.yml", "needs": ["a", "a"]},
+            }
+        }
+    )
+    assert spec.jobs["b"].needs == ["a"]
+    assert topological_order(spec) == ["a", "b"]
+    report = asyncio.run(WorkflowEngine(FakeRunner({}), spec).run())
+    assert report.results["b"].status == SUCCEEDED
+
+
+def test_load_workflow_unknown_dependency(tmp_path):
+    wf = tmp_path / "wf.yaml"
+    wf.write_text(
+        yaml.safe_dump({"jobs": {"a": {"playbook": "a.yml", "needs": ["ghost"]}}})
+    )
+    with pytest.raises(WorkflowError):
+        load_workflow(str(wf))
+
+
+def test_independent_jobs_run_concurrently_and_report_critical_path():
+    runner = FakeRunner(
+        {
+            "base.yml": 0.05,
+            "db.yml": 0.2,
+            "cache.yml": 0.05,
+            "app.yml": 0.05,
+            "smoke.yml": 0.05,
+        }
+    )
+    report = asyncio.run(WorkflowEngine(runner, _spec(), inventory="hosts.ini").run())
+
+    assert report.succeeded
+    assert runner.peak == 2  # db and cache overlap
+    assert report.critical_path == ["base", "db", "app", "smoke"]
+    assert report.makespan < report.serial_seconds
+    assert all(call[1] == "hosts.ini" for call in runner.calls)
+
+
+def test_concurrency_budget_is_enforced():
+    runner = FakeRunner({})
+    asyncio.run(WorkflowEngine(runner, _spec(), max_concurrency=1).run())
+    assert runner.peak == 1
+
+
+def test_failure_skips_dependents_only():
+    runner = FakeRunner({}, failing=["db.yml"])
+    report = asyncio.run(WorkflowEngine(runner, _spec()).run())
+
+    assert not report.succeeded
+    assert report.results["db"].status == FAILED
+    assert report.results["db"].returncode == 2
+    assert report.results["cache"].status == SUCCEEDED
+    assert report.results["app"].status == SKIPPED
+    assert report.results["smoke"].status == SKIPPED
+    assert [c[0] for c in runner.calls].count("app.yml") == 0